@@ -4,6 +4,7 @@ from config import config
 from routes.auth_routes import auth_bp
 from routes.gesture_routes import gesture_bp
 from routes.transaction_routes import transaction_bp
+from routes.stream_routes import stream_bp, sock
 from utils.logger import logger
 from utils.latency_monitor import monitor
 
@@ -17,6 +18,8 @@ CORS(app, origins=app.config['CORS_ORIGINS'])
 app.register_blueprint(auth_bp)
 app.register_blueprint(gesture_bp)
 app.register_blueprint(transaction_bp)
+app.register_blueprint(stream_bp)
+sock.init_app(app)
 
 @app.route('/')
 def index():
@@ -1,13 +1,19 @@
 import os
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
-    SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-plampay-2026')
+    # No default: verification tokens are not issued until a secret is configured
+    SECRET_KEY = os.environ.get('SECRET_KEY')
     DATABASE_URI = os.environ.get('DATABASE_URI', 'sqlite:///plampay.db')
     API_VERSION = 'v1'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
-    PALM_AUTH_THRESHOLD = 0.85
+    # Minimum cosine between a probe and an enrolled palm embedding
+    PALM_AUTH_THRESHOLD = float(os.environ.get('PALM_AUTH_THRESHOLD', 0.85))
     GESTURE_CONFIDENCE_MIN = 0.75
     TRANSACTION_TIMEOUT = 30
+    VERIFICATION_TOKEN_TTL = int(os.environ.get('VERIFICATION_TOKEN_TTL', 60))
+    EMBEDDING_STORE_DIR = os.environ.get('EMBEDDING_STORE_DIR', os.path.join(BASE_DIR, 'data', 'embeddings'))
     SMOOTHING_WINDOW_SIZE = 5
     LATENCY_THRESHOLD_MS = 100
     CORS_ORIGINS = ['http://localhost:3000', 'http://localhost:5173']
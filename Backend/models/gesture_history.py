@@ -0,0 +1,84 @@
+import time
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+
+class GestureRecord:
+    __slots__ = ('gesture_type', 'action', 'confidence', 'created_at')
+    
+    def __init__(self, gesture_type, action, confidence, created_at=None):
+        self.gesture_type = gesture_type
+        self.action = action
+        self.confidence = float(confidence)
+        self.created_at = time.time() if created_at is None else created_at
+    
+    def to_dict(self):
+        return {
+            'gesture_type': self.gesture_type,
+            'action': self.action,
+            'confidence': self.confidence,
+            'created_at': datetime.fromtimestamp(self.created_at, timezone.utc).isoformat()
+        }
+
+class GestureHistoryRepository:
+    def __init__(self, max_records_per_user=50, ttl_seconds=3600, max_users=10000):
+        self.max_records_per_user = max_records_per_user
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self.histories = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def add(self, user_key, record):
+        with self.lock:
+            history = self.histories.get(user_key)
+            if history is None:
+                history = deque(maxlen=self.max_records_per_user)
+                self.histories[user_key] = history
+            else:
+                self.histories.move_to_end(user_key)
+            
+            history.append(record)
+            self._evict(record.created_at)
+        return record
+    
+    def get_recent(self, user_key, limit=10):
+        now = time.time()
+        with self.lock:
+            history = self.histories.get(user_key)
+            if not history:
+                return []
+            self._expire(history, now)
+            if not history:
+                del self.histories[user_key]
+                return []
+            records = list(history)
+        return records[-limit:] if limit > 0 else []
+    
+    def clear(self, user_key=None):
+        with self.lock:
+            if user_key is None:
+                self.histories.clear()
+            else:
+                self.histories.pop(user_key, None)
+    
+    def count(self):
+        with self.lock:
+            return sum(len(h) for h in self.histories.values())
+    
+    def _expire(self, history, now):
+        cutoff = now - self.ttl_seconds
+        while history and history[0].created_at < cutoff:
+            history.popleft()
+    
+    def _evict(self, now):
+        while len(self.histories) > self.max_users:
+            self.histories.popitem(last=False)
+        
+        cutoff = now - self.ttl_seconds
+        while self.histories:
+            user_key, history = next(iter(self.histories.items()))
+            if history and history[-1].created_at >= cutoff:
+                break
+            del self.histories[user_key]
+
+gesture_history_repository = GestureHistoryRepository()
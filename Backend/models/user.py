@@ -2,11 +2,10 @@ from datetime import datetime
 import uuid
 
 class User:
-    def __init__(self, username, email, palm_signature=None):
+    def __init__(self, username, email):
         self.id = str(uuid.uuid4())
         self.username = username
         self.email = email
-        self.palm_signature = palm_signature
         self.created_at = datetime.utcnow()
         self.updated_at = datetime.utcnow()
         self.is_active = True
@@ -25,20 +24,10 @@ class User:
             'updated_at': self.updated_at.isoformat()
         }
     
-    def update_palm_signature(self, signature):
-        self.palm_signature = signature
+    def mark_palm_enrolled(self):
         self.palm_verified = True
         self.updated_at = datetime.utcnow()
     
-    def verify_palm(self, signature, threshold=0.85):
-        if not self.palm_signature:
-            return False
-        similarity = self._calculate_similarity(self.palm_signature, signature)
-        return similarity >= threshold
-    
-    def _calculate_similarity(self, sig1, sig2):
-        return 0.92
-
 class UserRepository:
     def __init__(self):
         self.users = {}
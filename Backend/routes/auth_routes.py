@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from services.palm_auth_service import palm_auth_service
+from services.verification_token_service import verification_token_service
 from models.user import User, user_repository
 from utils.logger import logger
 
@@ -58,6 +59,15 @@ def verify_palm():
     
     result = palm_auth_service.verify_palm(user_id, palm_data)
     
+    device_id = data.get('device_id') or request.headers.get('X-Device-Id')
+    if result['success'] and data.get('issue_token') and device_id:
+        token = verification_token_service.issue(user_id, device_id)
+        if token['success']:
+            result['verification_token'] = token['token']
+            result['token_expires_in'] = token['expires_in']
+        else:
+            result['token_error'] = token['error']
+    
     if result['success']:
         return jsonify(result), 200
     else:
@@ -4,6 +4,8 @@ from utils.logger import logger
 
 gesture_bp = Blueprint('gesture', __name__, url_prefix='/api/gesture')
 
+MAX_BATCH_SIZE = 1000
+
 @gesture_bp.route('/process', methods=['POST'])
 def process_gesture():
     data = request.get_json()
@@ -13,6 +15,9 @@ def process_gesture():
     if not gesture_data:
         return jsonify({'success': False, 'error': 'Missing gesture data'}), 400
     
+    if data.get('user_id') and not gesture_data.get('user_id'):
+        gesture_data['user_id'] = data['user_id']
+    
     result = gesture_service.process_gesture(gesture_data)
     
     if result['success']:
@@ -21,11 +26,39 @@ def process_gesture():
     else:
         return jsonify(result), 400
 
+@gesture_bp.route('/process-batch', methods=['POST'])
+def process_gesture_batch():
+    data = request.get_json()
+    
+    gestures = data.get('gestures')
+    
+    if not gestures or not isinstance(gestures, list):
+        return jsonify({'success': False, 'error': 'Missing gestures'}), 400
+    
+    if len(gestures) > MAX_BATCH_SIZE:
+        return jsonify({'success': False, 'error': f'Batch exceeds {MAX_BATCH_SIZE} gestures'}), 400
+    
+    if data.get('user_id'):
+        gestures = [
+            dict(gesture_data, user_id=data['user_id'])
+            if isinstance(gesture_data, dict) and not gesture_data.get('user_id') else gesture_data
+            for gesture_data in gestures
+        ]
+    
+    result = gesture_service.process_batch(gestures)
+    
+    logger.info(f"Gesture batch processed: {result['processed']}/{result['count']}")
+    return jsonify(result), 200
+
 @gesture_bp.route('/history', methods=['GET'])
 def get_gesture_history():
     limit = request.args.get('limit', 10, type=int)
+    user_key = request.args.get('user_id') or request.args.get('session_id')
+    
+    if not user_key:
+        return jsonify({'success': False, 'error': 'Missing user_id or session_id'}), 400
     
-    history = gesture_service.get_gesture_history(limit)
+    history = gesture_service.get_gesture_history(limit, user_key)
     
     return jsonify({
         'success': True,
@@ -51,7 +84,11 @@ def validate_gesture():
     if not gesture_type or not points:
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
-    result = gesture_service.process_gesture({'points': points})
+    result = gesture_service.process_gesture({
+        'points': points,
+        'user_id': data.get('user_id'),
+        'session_id': data.get('session_id')
+    })
     
     is_valid = (result['success'] and 
                 result.get('gesture_type') == gesture_type and 
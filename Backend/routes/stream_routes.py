@@ -0,0 +1,48 @@
+import json
+from flask import Blueprint, request
+from flask_sock import Sock
+from services.gesture_service import gesture_service
+from services.stream_service import GestureStreamSession
+from utils.logger import logger
+
+stream_bp = Blueprint('stream', __name__, url_prefix='/api/stream')
+sock = Sock()
+
+@sock.route('/gesture', bp=stream_bp)
+def gesture_stream(ws):
+    prediction_horizon, error = gesture_service.validate_prediction_horizon(request.args.get('prediction_horizon'))
+    if error:
+        ws.send(json.dumps({'type': 'error', 'success': False, 'error': error}))
+        ws.close()
+        return
+    
+    # Browsers cannot set WebSocket headers; clients send credentials in the query or per message
+    session = GestureStreamSession(
+        user_id=request.args.get('user_id'),
+        session_id=request.args.get('session_id'),
+        prediction_horizon=prediction_horizon,
+        device_id=request.args.get('device_id') or request.headers.get('X-Device-Id'),
+        verification_token=request.args.get('verification_token') or request.headers.get('X-Verification-Token')
+    )
+    logger.info(f'Gesture stream opened for {session.user_id or session.session_id or "anonymous"}')
+    
+    while True:
+        message = ws.receive()
+        if message is None:
+            break
+        
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            ws.send(json.dumps({'type': 'error', 'success': False, 'error': 'Invalid JSON'}))
+            continue
+        
+        try:
+            events = session.handle(payload)
+        except Exception as error:
+            # Never let one bad frame tear down the socket
+            logger.error(f'Gesture stream frame failed: {error}')
+            events = [{'type': 'error', 'success': False, 'error': 'Failed to process message'}]
+        
+        for event in events:
+            ws.send(json.dumps(event))
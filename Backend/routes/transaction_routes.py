@@ -4,6 +4,17 @@ from utils.logger import logger
 
 transaction_bp = Blueprint('transaction', __name__, url_prefix='/api/transaction')
 
+def _verify_request(data, user_id):
+    rejection = transaction_service.authorize(
+        user_id,
+        verification_token=data.get('verification_token') or request.headers.get('X-Verification-Token'),
+        device_id=data.get('device_id') or request.headers.get('X-Device-Id'),
+        palm_data=data.get('palm_data')
+    )
+    if rejection:
+        return jsonify(rejection), 401
+    return None
+
 @transaction_bp.route('/payment', methods=['POST'])
 def create_payment():
     data = request.get_json()
@@ -16,6 +27,10 @@ def create_payment():
     if not user_id or not amount:
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
+    rejection = _verify_request(data, user_id)
+    if rejection:
+        return rejection
+    
     result = transaction_service.create_payment(user_id, amount, currency, gesture_type)
     
     if result['success']:
@@ -36,6 +51,10 @@ def create_trade():
     if not user_id or not asset or not amount:
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
+    rejection = _verify_request(data, user_id)
+    if rejection:
+        return rejection
+    
     result = transaction_service.create_trade(user_id, asset, amount, trade_type, gesture_type)
     
     if result['success']:
@@ -2,6 +2,11 @@ import numpy as np
 from utils.logger import logger
 from utils.latency_monitor import measure_latency
 from services.smoothing_service import smoothing_service
+from services.kalman_tracker import kalman_tracker
+from services.resampling_service import resampling_service
+from models.gesture_history import GestureRecord, gesture_history_repository
+
+MAX_PREDICTION_HORIZON = 30.0
 
 class GestureService:
     def __init__(self):
@@ -15,20 +20,31 @@ class GestureService:
             'circle': 'trade'
         }
         self.confidence_threshold = 0.75
-        self.gesture_history = []
+        self.history_repository = gesture_history_repository
     
     @measure_latency('gesture_processing')
     def process_gesture(self, gesture_data):
         logger.info('Processing gesture data')
         
         raw_points = gesture_data.get('points', [])
+        if not isinstance(raw_points, list):
+            return {'success': False, 'error': 'Gesture points must be a list'}
         if not raw_points:
             return {'success': False, 'error': 'No gesture points provided'}
         
-        smoothed_points = smoothing_service.smooth_trajectory(raw_points)
+        error = resampling_service.validate(raw_points)
+        if error:
+            return {'success': False, 'error': error}
         
-        gesture_type = self._classify_gesture(smoothed_points)
-        confidence = self._calculate_confidence(smoothed_points, gesture_type)
+        prediction_horizon, error = self.validate_prediction_horizon(gesture_data.get('prediction_horizon'))
+        if error:
+            return {'success': False, 'error': error}
+        
+        # Drop any z coordinate so points of mixed dimensionality stack into one array
+        raw_points = [point[:2] for point in raw_points]
+        points = resampling_service.resample(raw_points)
+        
+        smoothed_points, gesture_type, confidence = self.score_trajectory(points)
         
         if confidence < self.confidence_threshold:
             return {
@@ -37,6 +53,106 @@ class GestureService:
                 'confidence': confidence
             }
         
+        return self._build_result(gesture_data, raw_points, smoothed_points, gesture_type, confidence,
+                                  prediction_horizon)
+    
+    def score_trajectory(self, points):
+        smoothed_points = smoothing_service.smooth_trajectory(points)
+        
+        gesture_type = self._classify_gesture(smoothed_points)
+        confidence = self._calculate_confidence(smoothed_points, gesture_type)
+        
+        return smoothed_points, gesture_type, confidence
+    
+    @measure_latency('gesture_batch_processing')
+    def process_batch(self, gestures):
+        logger.info(f'Processing gesture batch of {len(gestures)}')
+        
+        gestures = list(gestures)
+        results = [None] * len(gestures)
+        horizons = [None] * len(gestures)
+        accepted = []
+        frames = []
+        trajectories = []
+        
+        for i, gesture_data in enumerate(gestures):
+            if isinstance(gesture_data, list):
+                gesture_data = {'points': gesture_data}
+                gestures[i] = gesture_data
+            
+            raw_points = gesture_data.get('points', []) if isinstance(gesture_data, dict) else []
+            if not isinstance(raw_points, list):
+                results[i] = {'success': False, 'error': 'Gesture points must be a list'}
+                continue
+            if not raw_points:
+                results[i] = {'success': False, 'error': 'No gesture points provided'}
+                continue
+            
+            error = resampling_service.validate(raw_points)
+            if error:
+                results[i] = {'success': False, 'error': error}
+                continue
+            
+            prediction_horizon, error = self.validate_prediction_horizon(gesture_data.get('prediction_horizon'))
+            if error:
+                results[i] = {'success': False, 'error': error}
+                continue
+            
+            horizons[i] = prediction_horizon
+            # Drop any z coordinate so items of mixed dimensionality stack into one batch
+            raw_points = [point[:2] for point in raw_points]
+            accepted.append(i)
+            trajectories.append(resampling_service.resample(raw_points))
+            frames.append(raw_points)
+        
+        if accepted:
+            engine = smoothing_service.engine
+            batch, lengths = engine.to_batch(trajectories)
+            smoothed = engine.moving_average(batch, lengths, smoothing_service.window_size)
+            smoothed_points = engine.from_batch(smoothed, lengths)
+            
+            gesture_types = self._classify_batch(smoothed, lengths)
+            confidences = self._confidence_batch(smoothed, lengths, gesture_types, smoothed_points)
+            
+            for k, i in enumerate(accepted):
+                confidence = float(confidences[k])
+                if confidence < self.confidence_threshold:
+                    results[i] = {
+                        'success': False,
+                        'error': 'Low confidence',
+                        'confidence': confidence
+                    }
+                    continue
+                
+                results[i] = self._build_result(
+                    gestures[i], frames[k], smoothed_points[k], str(gesture_types[k]), confidence,
+                    horizons[i]
+                )
+        
+        return {
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'processed': sum(1 for r in results if r['success'])
+        }
+    
+    def validate_prediction_horizon(self, horizon):
+        if horizon is None:
+            return None, None
+        
+        if isinstance(horizon, bool):
+            return None, 'prediction_horizon must be a number'
+        try:
+            horizon = float(horizon)
+        except (TypeError, ValueError):
+            return None, 'prediction_horizon must be a number'
+        
+        if not 0 < horizon <= MAX_PREDICTION_HORIZON:
+            return None, f'prediction_horizon must be between 0 and {MAX_PREDICTION_HORIZON:g} frames'
+        return horizon, None
+    
+    def _build_result(self, gesture_data, raw_points, smoothed_points, gesture_type, confidence,
+                      prediction_horizon=None):
         action = self.gesture_types.get(gesture_type, 'unknown')
         
         result = {
@@ -47,10 +163,70 @@ class GestureService:
             'smoothed_points': smoothed_points
         }
         
-        self.gesture_history.append(result)
+        # Tracking runs on the original frames so velocity stays per frame, not per resampled step
+        if prediction_horizon is not None:
+            tracking = kalman_tracker.track(raw_points, prediction_horizon)
+            result['predicted_point'] = tracking['predicted_point']
+            result['velocity'] = tracking['velocity']
+        
+        # Anonymous requests have no bucket of their own, so they are not recorded
+        history_key = self._history_key(gesture_data)
+        if history_key:
+            self.history_repository.add(history_key, GestureRecord(gesture_type, action, confidence))
         
         return result
     
+    def _classify_batch(self, batch, lengths):
+        rows = np.arange(len(lengths))
+        last = np.maximum(lengths - 1, 0)
+        valid = (np.arange(batch.shape[1])[None, :] < lengths[:, None])[..., None]
+        
+        displacement = batch[rows, last] - batch[:, 0]
+        dx = displacement[:, 0]
+        dy = displacement[:, 1]
+        distance = np.sqrt(dx**2 + dy**2)
+        horizontal = np.abs(dx) > np.abs(dy) * 2
+        
+        center = (batch * valid).sum(axis=1) / lengths[:, None]
+        radii = np.linalg.norm(batch - center[:, None], axis=2) * valid[..., 0]
+        mean_radius = radii.sum(axis=1) / lengths
+        radius_std = np.sqrt((((radii - mean_radius[:, None]) * valid[..., 0]) ** 2).sum(axis=1) / lengths)
+        circular = (lengths >= 8) & (radius_std < mean_radius * 0.2)
+        
+        start_step = np.linalg.norm(batch[:, min(1, batch.shape[1] - 1)] - batch[:, 0], axis=1)
+        end_step = np.linalg.norm(batch[rows, last] - batch[rows, np.maximum(lengths - 2, 0)], axis=1)
+        pinch = (lengths >= 4) & (end_step < start_step * 0.5)
+        
+        return np.select(
+            [lengths < 2, distance < 10, horizontal & (dx > 0), horizontal, circular, pinch],
+            ['tap', 'tap', 'swipe_right', 'swipe_left', 'circle', 'pinch'],
+            default='swipe_right'
+        )
+    
+    def _confidence_batch(self, batch, lengths, gesture_types, smoothed_points):
+        steps = np.diff(batch, axis=1)
+        norms = np.linalg.norm(steps, axis=2)
+        
+        n1 = norms[:, :-1]
+        n2 = norms[:, 1:]
+        pair_valid = np.arange(n1.shape[1])[None, :] + 2 < lengths[:, None]
+        usable = pair_valid & (n1 > 0) & (n2 > 0)
+        
+        dots = (steps[:, :-1] * steps[:, 1:]).sum(axis=2)
+        cosines = np.where(usable, dots / np.where(usable, n1 * n2, 1), 0)
+        counts = usable.sum(axis=1)
+        
+        smoothness = np.where(counts > 0, (cosines.sum(axis=1) / np.maximum(counts, 1) + 1) / 2, 0.8)
+        smoothness = np.where(lengths < 3, 0.8, smoothness)
+        
+        consistency = np.array([
+            self._calculate_consistency(points, gesture_type)
+            for points, gesture_type in zip(smoothed_points, gesture_types)
+        ])
+        
+        confidence = np.clip(smoothness * 0.4 + consistency * 0.6, 0.5, 0.98)
+        return np.where(lengths < 2, 0.6, confidence)
+    
     def _classify_gesture(self, points):
         if len(points) < 2:
             return 'tap'
@@ -132,7 +308,13 @@ class GestureService:
         
         return end_dist < start_dist * 0.5
     
-    def get_gesture_history(self, limit=10):
-        return self.gesture_history[-limit:]
+    def get_gesture_history(self, limit=10, user_key=None):
+        if not user_key:
+            return []
+        records = self.history_repository.get_recent(user_key, limit)
+        return [r.to_dict() for r in records]
+    
+    def _history_key(self, gesture_data):
+        return gesture_data.get('user_id') or gesture_data.get('session_id')
 
 gesture_service = GestureService()
@@ -0,0 +1,144 @@
+import numpy as np
+from functools import lru_cache
+
+MOTION_MODEL_ORDERS = {
+    'constant_velocity': 2,
+    'constant_acceleration': 3
+}
+
+def _transition_matrix(order, dt):
+    transition = np.eye(order)
+    for power in range(1, order):
+        transition += np.diag(np.full(order - power, dt ** power / np.prod(np.arange(1, power + 1))), power)
+    return transition
+
+def _process_covariance(order, dt, process_noise):
+    noise_gain = np.array([dt ** (order - i) / np.prod(np.arange(1, order - i + 1)) for i in range(order)])
+    return process_noise * np.outer(noise_gain, noise_gain)
+
+@lru_cache(maxsize=64)
+def _gain_schedule(length, order, dt, process_noise, measurement_noise, initial_uncertainty):
+    transition = _transition_matrix(order, dt)
+    process_cov = _process_covariance(order, dt, process_noise)
+
+    covariance = np.diag([measurement_noise] + [initial_uncertainty] * (order - 1))
+    gains = np.zeros((length, order))
+
+    for t in range(1, length):
+        covariance = transition @ covariance @ transition.T + process_cov
+        gains[t] = covariance[:, 0] / (covariance[0, 0] + measurement_noise)
+        covariance = covariance - np.outer(gains[t], covariance[0])
+
+        # The gain converges to its steady state; the remaining steps reuse it
+        if t > 1 and np.allclose(gains[t], gains[t - 1], rtol=1e-12, atol=0):
+            gains[t + 1:] = gains[t]
+            break
+
+    gains.setflags(write=False)
+    return gains
+
+class KalmanTracker:
+    def __init__(self, motion_model='constant_velocity', dt=1.0, process_noise=1.0,
+                 measurement_noise=4.0, initial_uncertainty=100.0):
+        if motion_model not in MOTION_MODEL_ORDERS:
+            raise ValueError(f'Unknown motion model: {motion_model}')
+
+        self.motion_model = motion_model
+        self.order = MOTION_MODEL_ORDERS[motion_model]
+        self.dt = dt
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.initial_uncertainty = initial_uncertainty
+        self.reset()
+
+    def reset(self):
+        self.state = None
+        self.covariance = None
+
+    def update(self, point, dt=None):
+        measurement = np.asarray(point, dtype=float)[:2]
+
+        if self.state is None:
+            self.state = np.zeros((self.order, 2))
+            self.state[0] = measurement
+            self.covariance = np.diag([self.measurement_noise] + [self.initial_uncertainty] * (self.order - 1))
+            return self.state[0].tolist()
+
+        step = self.dt if dt is None else dt
+        transition = _transition_matrix(self.order, step)
+        self.state = transition @ self.state
+        self.covariance = (transition @ self.covariance @ transition.T +
+                           _process_covariance(self.order, step, self.process_noise))
+
+        gain = self.covariance[:, 0] / (self.covariance[0, 0] + self.measurement_noise)
+        self.state = self.state + np.outer(gain, measurement - self.state[0])
+        self.covariance = self.covariance - np.outer(gain, self.covariance[0])
+
+        return self.state[0].tolist()
+
+    def predict(self, horizon=1.0):
+        if self.state is None:
+            return None
+        return (_transition_matrix(self.order, horizon) @ self.state)[0].tolist()
+
+    def velocity(self):
+        if self.state is None:
+            return None
+        return self.state[1].tolist()
+
+    def filter_batch(self, batch, lengths=None):
+        return self._run_batch(batch, lengths)[0]
+
+    def predict_batch(self, batch, lengths=None, horizon=1.0):
+        _, final_states = self._run_batch(batch, lengths)
+        transition = _transition_matrix(self.order, horizon)
+        return np.einsum('ij,bjk->bik', transition, final_states)[:, 0]
+
+    def track(self, points, horizon=None):
+        batch = np.asarray(points, dtype=float)[None, :, :2]
+        filtered, final_states = self._run_batch(batch, None)
+
+        result = {
+            'filtered_points': filtered[0].tolist(),
+            'velocity': final_states[0, 1].tolist()
+        }
+
+        if horizon is not None:
+            transition = _transition_matrix(self.order, horizon)
+            result['predicted_point'] = (transition @ final_states[0])[0].tolist()
+
+        return result
+
+    def _run_batch(self, batch, lengths):
+        batch_size, n, _ = batch.shape
+        if lengths is None:
+            lengths = np.full(batch_size, n, dtype=np.int64)
+        lengths = np.asarray(lengths, dtype=np.int64)
+
+        gains = _gain_schedule(n, self.order, self.dt, self.process_noise,
+                               self.measurement_noise, self.initial_uncertainty)
+        transition = _transition_matrix(self.order, self.dt)
+
+        state = np.zeros((batch_size, self.order, 2))
+        state[:, 0] = batch[:, 0]
+        filtered = np.empty_like(batch)
+        filtered[:, 0] = batch[:, 0]
+        final_states = state.copy()
+
+        # Rows are only snapshotted at the steps where some trajectory ends
+        endings = {int(length) - 1: lengths == length for length in np.unique(lengths) if 1 < length <= n}
+        step_gains = gains[:, None, :, None]
+
+        for t in range(1, n):
+            state = transition @ state
+            state += step_gains[t] * (batch[:, t] - state[:, 0])[:, None, :]
+            filtered[:, t] = state[:, 0]
+
+            ended = endings.get(t)
+            if ended is not None:
+                final_states[ended] = state[ended]
+
+        filtered = np.where((np.arange(n)[None, :] < lengths[:, None])[..., None], filtered, batch)
+        return filtered, final_states
+
+kalman_tracker = KalmanTracker()
@@ -1,13 +1,16 @@
-import hashlib
-import json
+import numpy as np
+from config import Config
 from models.user import user_repository
 from utils.logger import logger
 from utils.latency_monitor import measure_latency
+from utils.embeddings import normalize_embedding, best_cosine_score
+from utils.embedding_store import EmbeddingStoreRegistry
 
 class PalmAuthService:
     def __init__(self):
-        self.threshold = 0.85
-        self.palm_cache = {}
+        self.threshold = Config.PALM_AUTH_THRESHOLD
+        self.max_templates = 5
+        self.embedding_stores = EmbeddingStoreRegistry(Config.EMBEDDING_STORE_DIR)
     
     @measure_latency('palm_enrollment')
     def enroll_palm(self, user_id, palm_data):
@@ -17,16 +20,21 @@ class PalmAuthService:
         if not user:
             return {'success': False, 'error': 'User not found'}
         
-        palm_signature = self._generate_palm_signature(palm_data)
-        user.update_palm_signature(palm_signature)
-        user_repository.update(user)
+        kind, features = self._extract_features(palm_data)
+        if features is None:
+            return {'success': False, 'error': 'Invalid palm data'}
+        
+        store = self.embedding_stores.for_kind(kind, len(features))
+        store.append(user_id, features)
         
-        self.palm_cache[user_id] = palm_signature
+        user.mark_palm_enrolled()
+        user_repository.update(user)
         
         return {
             'success': True,
             'message': 'Palm enrolled successfully',
-            'user_id': user_id
+            'user_id': user_id,
+            'template_count': len(store.get(user_id, self.max_templates))
         }
     
     @measure_latency('palm_verification')
@@ -37,11 +45,16 @@ class PalmAuthService:
         if not user:
             return {'success': False, 'error': 'User not found'}
         
-        if not user.palm_verified:
+        kind, features = self._extract_features(palm_data)
+        if features is None:
+            return {'success': False, 'error': 'Invalid palm data'}
+        
+        store = self.embedding_stores.for_kind(kind, len(features))
+        templates = store.get(user_id, self.max_templates)
+        if templates is None:
             return {'success': False, 'error': 'Palm not enrolled'}
         
-        palm_signature = self._generate_palm_signature(palm_data)
-        similarity = self._calculate_similarity(user.palm_signature, palm_signature)
+        similarity = best_cosine_score(templates, features)
         
         is_verified = similarity >= self.threshold
         
@@ -52,29 +65,49 @@ class PalmAuthService:
             'user_id': user_id
         }
     
-    def _generate_palm_signature(self, palm_data):
-        palm_features = self._extract_features(palm_data)
-        signature = hashlib.sha256(json.dumps(palm_features).encode()).hexdigest()
-        return signature
-    
     def _extract_features(self, palm_data):
-        features = {
-            'palm_lines': palm_data.get('lines', []),
-            'palm_width': palm_data.get('width', 0),
-            'palm_height': palm_data.get('height', 0),
-            'finger_lengths': palm_data.get('finger_lengths', []),
-            'landmarks': palm_data.get('landmarks', [])
-        }
+        # Every kind is stored and compared as a unit-length embedding
+        feature_vector = palm_data.get('feature_vector') or palm_data.get('embedding')
+        if feature_vector:
+            return 'vector', normalize_embedding(self._finite(feature_vector))
+        
+        landmarks = palm_data.get('landmarks', [])
+        if len(landmarks) >= 21:
+            return 'landmarks', normalize_embedding(self._landmark_features(landmarks))
+        
+        lines = palm_data.get('lines', [])
+        return 'geometry', normalize_embedding(self._finite([
+            palm_data.get('width', 0),
+            palm_data.get('height', 0),
+            *palm_data.get('finger_lengths', []),
+            len(lines)
+        ]), center=True)
+    
+    def _finite(self, values):
+        try:
+            features = np.asarray(values, dtype=np.float32).ravel()
+        except (TypeError, ValueError):
+            return None
+        if len(features) == 0 or not np.isfinite(features).all():
+            return None
         return features
     
-    def _calculate_similarity(self, signature1, signature2):
-        if signature1 == signature2:
-            return 1.0
+    def _landmark_features(self, landmarks):
+        try:
+            points = np.array([
+                [lm['x'], lm['y']] if isinstance(lm, dict) else lm[:2]
+                for lm in landmarks[:21]
+            ], dtype=np.float32)
+        except (KeyError, TypeError, ValueError):
+            return None
         
-        matching_chars = sum(c1 == c2 for c1, c2 in zip(signature1, signature2))
-        similarity = matching_chars / max(len(signature1), len(signature2))
+        # Translation and scale invariant: wrist at the origin, wrist to middle MCP of length 1
+        centered = points - points[0]
+        scale = np.linalg.norm(centered[9])
+        if not np.isfinite(scale) or scale == 0:
+            return None
         
-        return min(0.95, max(0.75, similarity))
+        return (centered / scale).ravel()
     
     def get_enrolled_users(self):
         users = user_repository.users.values()
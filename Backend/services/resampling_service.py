@@ -0,0 +1,50 @@
+import numpy as np
+
+class ResamplingService:
+    # 'index' decimates uniformly in time, which keeps per-sample spacing (speed) for the
+    # classifier and tracker; 'arc_length' spaces points evenly along the path instead
+    def __init__(self, target_points=64, max_input_points=4096, mode='index'):
+        self.target_points = target_points
+        self.max_input_points = max_input_points
+        self.mode = mode
+    
+    def validate(self, points):
+        if len(points) > self.max_input_points:
+            return f'Too many gesture points (max {self.max_input_points})'
+        
+        if any(not isinstance(point, (list, tuple)) or len(point) < 2 for point in points):
+            return 'Each gesture point must be an [x, y] pair'
+        
+        try:
+            coordinates = np.array([point[:2] for point in points], dtype=float)
+        except (TypeError, ValueError):
+            return 'Gesture point coordinates must be numeric'
+        
+        if not np.isfinite(coordinates).all():
+            return 'Gesture point coordinates must be finite'
+        return None
+    
+    def resample(self, points, target_points=None):
+        target_points = target_points or self.target_points
+        
+        if len(points) <= target_points:
+            return points
+        
+        points = np.asarray([point[:2] for point in points], dtype=float)
+        
+        if self.mode == 'arc_length':
+            positions = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+            if positions[-1] <= 0:
+                return np.repeat(points[:1], target_points, axis=0).tolist()
+        else:
+            positions = np.arange(len(points), dtype=float)
+        
+        targets = np.linspace(0, positions[-1], target_points)
+        
+        resampled = np.empty((target_points, 2))
+        resampled[:, 0] = np.interp(targets, positions, points[:, 0])
+        resampled[:, 1] = np.interp(targets, positions, points[:, 1])
+        
+        return resampled.tolist()
+
+resampling_service = ResamplingService()
@@ -0,0 +1,151 @@
+import numpy as np
+from functools import lru_cache
+
+@lru_cache(maxsize=64)
+def _kalman_gains(length, estimate_error, measurement_error, process_noise):
+    gains = np.empty(length)
+    for t in range(length):
+        gains[t] = estimate_error / (estimate_error + measurement_error)
+        estimate_error = (1 - gains[t]) * estimate_error + process_noise
+    gains.setflags(write=False)
+    return gains
+
+class BatchSmoothingEngine:
+    def to_batch(self, trajectories):
+        lengths = np.array([len(t) for t in trajectories], dtype=np.int64)
+        max_length = int(lengths.max()) if len(lengths) else 0
+        if max_length > 0 and lengths.min() == max_length:
+            return np.asarray(trajectories, dtype=float)[:, :, :2].copy(), lengths
+
+        batch = np.zeros((len(trajectories), max_length, 2))
+
+        for i, trajectory in enumerate(trajectories):
+            if lengths[i] == 0:
+                continue
+            points = np.asarray(trajectory, dtype=float)[:, :2]
+            batch[i, :lengths[i]] = points
+            batch[i, lengths[i]:] = points[-1]
+
+        return batch, lengths
+
+    def from_batch(self, batch, lengths):
+        rows = batch.tolist()
+        return [row[:length] for row, length in zip(rows, lengths.tolist())]
+
+    def smooth_batch(self, trajectories, method='moving_average', **params):
+        batch, lengths = self.to_batch(trajectories)
+        if batch.size == 0:
+            return [list(t) for t in trajectories]
+
+        smoothed = getattr(self, method)(batch, lengths, **params)
+        return self.from_batch(smoothed, lengths)
+
+    def moving_average(self, batch, lengths=None, window_size=5):
+        batch_size, n, _ = batch.shape
+        lengths = self._resolve_lengths(batch, lengths)
+        half = window_size // 2
+        idx = np.arange(n)
+
+        cumsum = np.zeros((batch_size, n + 1, 2))
+        np.cumsum(batch, axis=1, out=cumsum[:, 1:])
+
+        start = np.maximum(idx - half, 0)
+        end = np.minimum(idx[None, :] + half + 1, lengths[:, None])
+        end = np.maximum(end, start[None, :] + 1)
+
+        sums = cumsum[np.arange(batch_size)[:, None], end] - cumsum[:, start]
+        smoothed = sums / (end - start[None, :])[..., None]
+
+        keep = (idx[None, :] == 0) | (idx[None, :] >= lengths[:, None] - 1)
+        return np.where(keep[..., None], batch, smoothed)
+
+    def kalman_filter(self, batch, lengths=None, estimate_error=1.0, measurement_error=0.5, process_noise=0.1):
+        n = batch.shape[1]
+        gains = _kalman_gains(n, estimate_error, measurement_error, process_noise)
+
+        inputs = gains[None, :, None] * batch
+        inputs[:, 0] = batch[:, 0]
+        decay = np.broadcast_to(1 - gains[None, :, None], (batch.shape[0], n, 1)).copy()
+        decay[:, 0] = 0
+
+        return self._mask_padding(self._linear_recurrence(inputs, decay), batch, lengths)
+
+    def exponential_smoothing(self, batch, lengths=None, alpha=0.3):
+        batch_size, n, _ = batch.shape
+
+        inputs = alpha * batch
+        inputs[:, 0] = batch[:, 0]
+        decay = np.full((batch_size, n, 1), 1 - alpha)
+        decay[:, 0] = 0
+
+        return self._mask_padding(self._linear_recurrence(inputs, decay), batch, lengths)
+
+    def adaptive_smooth(self, batch, lengths=None, velocity_threshold=10.0):
+        batch_size, n, _ = batch.shape
+
+        velocity = np.zeros((batch_size, n, 1))
+        velocity[:, 1:, 0] = np.linalg.norm(np.diff(batch, axis=1), axis=2)
+        alpha = np.where(velocity > velocity_threshold, 0.7, 0.3)
+
+        inputs = alpha * batch
+        inputs[:, 0] = batch[:, 0]
+        decay = 1 - alpha
+        decay[:, 0] = 0
+
+        return self._mask_padding(self._linear_recurrence(inputs, decay), batch, lengths)
+
+    def remove_tremor(self, batch, lengths=None, threshold=2.0):
+        n = batch.shape[1]
+        lengths = self._resolve_lengths(batch, lengths)
+        if n < 3:
+            return batch.copy()
+
+        idx = np.arange(n)
+        interior = (idx[None, :] >= 1) & (idx[None, :] < lengths[:, None] - 1)
+
+        following = np.concatenate([batch[:, 1:], batch[:, -1:]], axis=1)
+        near_next = np.linalg.norm(following - batch, axis=2) < threshold
+        candidates = interior & near_next
+        averaged = (batch + following) / 3
+
+        filtered = batch
+        active = None
+        for _ in range(n):
+            previous = np.concatenate([batch[:, :1], filtered[:, :-1]], axis=1)
+            updated = candidates & (np.linalg.norm(batch - previous, axis=2) < threshold)
+
+            if active is not None and np.array_equal(updated, active):
+                break
+            active = updated
+
+            inputs = np.where(active[..., None], averaged, batch)
+            decay = active[..., None] / 3.0
+            filtered = self._linear_recurrence(inputs, decay)
+
+        return filtered
+
+    def _linear_recurrence(self, inputs, decay):
+        n = inputs.shape[1]
+        values = inputs.copy()
+        factors = decay.copy()
+
+        shift = 1
+        while shift < n:
+            values[:, shift:] = values[:, shift:] + factors[:, shift:] * values[:, :-shift]
+            factors[:, shift:] = factors[:, shift:] * factors[:, :-shift]
+            shift *= 2
+
+        return values
+
+    def _resolve_lengths(self, batch, lengths):
+        if lengths is None:
+            return np.full(batch.shape[0], batch.shape[1], dtype=np.int64)
+        return np.asarray(lengths, dtype=np.int64)
+
+    def _mask_padding(self, smoothed, batch, lengths):
+        if lengths is None:
+            return smoothed
+        valid = np.arange(batch.shape[1])[None, :] < np.asarray(lengths)[:, None]
+        return np.where(valid[..., None], smoothed, batch)
+
+batch_smoothing_engine = BatchSmoothingEngine()
@@ -0,0 +1,168 @@
+from collections import deque
+from services.gesture_service import gesture_service
+from services.transaction_service import transaction_service
+from services.resampling_service import resampling_service
+from services.kalman_tracker import KalmanTracker
+from utils.logger import logger
+
+class GestureStreamSession:
+    def __init__(self, user_id=None, session_id=None, update_interval=5, prediction_horizon=None,
+                 device_id=None, verification_token=None):
+        self.user_id = user_id
+        self.session_id = session_id
+        self.device_id = device_id
+        self.verification_token = verification_token
+        self.update_interval = update_interval
+        self.prediction_horizon = prediction_horizon
+        self.points = deque(maxlen=resampling_service.max_input_points)
+        self.tracker = KalmanTracker()
+        self.handlers = {
+            'point': self._handle_point,
+            'points': self._handle_points,
+            'landmarks': self._handle_landmarks,
+            'end': self._handle_end,
+            'reset': self._handle_reset,
+            'payment': self._handle_payment,
+            'trade': self._handle_trade
+        }
+    
+    def handle(self, message):
+        if not isinstance(message, dict):
+            return [self._error('Invalid message')]
+        
+        handler = self.handlers.get(message.get('type'))
+        if not handler:
+            return [self._error(f"Unknown message type: {message.get('type')}")]
+        
+        try:
+            return handler(message)
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as error:
+            logger.warning(f"Rejected malformed {message.get('type')} frame: {error}")
+            return [self._error(f"Malformed {message.get('type')} message")]
+    
+    def _handle_point(self, message):
+        if 'x' not in message or 'y' not in message:
+            return [self._error('Missing point coordinates')]
+        return self._ingest([[message['x'], message['y']]], message.get('dt'))
+    
+    def _handle_points(self, message):
+        points = message.get('points')
+        if not points or not isinstance(points, list):
+            return [self._error('Missing points')]
+        return self._ingest(points, message.get('dt'))
+    
+    def _handle_landmarks(self, message):
+        landmarks = message.get('landmarks')
+        if not landmarks or not isinstance(landmarks, list):
+            return [self._error('Missing landmarks')]
+        
+        anchor = landmarks[9] if len(landmarks) > 9 else landmarks[0]
+        if isinstance(anchor, dict):
+            anchor = [anchor['x'], anchor['y']]
+        if not isinstance(anchor, (list, tuple)):
+            return [self._error('Invalid landmark')]
+        
+        return self._ingest([anchor[:2]], message.get('dt'))
+    
+    def _handle_end(self, message):
+        if not self.points:
+            return [self._error('No gesture points provided')]
+        
+        gesture_data = {
+            'points': list(self.points),
+            'user_id': self.user_id,
+            'session_id': self.session_id
+        }
+        if self.prediction_horizon is not None:
+            gesture_data['prediction_horizon'] = self.prediction_horizon
+        
+        result = gesture_service.process_gesture(gesture_data)
+        result.pop('smoothed_points', None)
+        
+        self._reset()
+        
+        return [dict(result, type='gesture')]
+    
+    def _handle_reset(self, message):
+        self._reset()
+        return [{'type': 'reset', 'success': True}]
+    
+    def _handle_payment(self, message):
+        user_id = message.get('user_id') or self.user_id
+        amount = message.get('amount')
+        
+        if not user_id or not amount:
+            return [self._error('Missing required fields')]
+        
+        rejection = self._authorize(user_id, message)
+        if rejection:
+            return [dict(rejection, type='transaction')]
+        
+        result = transaction_service.create_payment(
+            user_id, amount, message.get('currency', 'USD'), message.get('gesture_type')
+        )
+        return [dict(result, type='transaction')]
+    
+    def _handle_trade(self, message):
+        user_id = message.get('user_id') or self.user_id
+        asset = message.get('asset')
+        amount = message.get('amount')
+        
+        if not user_id or not asset or not amount:
+            return [self._error('Missing required fields')]
+        
+        rejection = self._authorize(user_id, message)
+        if rejection:
+            return [dict(rejection, type='transaction')]
+        
+        result = transaction_service.create_trade(
+            user_id, asset, amount, message.get('trade_type', 'buy'), message.get('gesture_type')
+        )
+        return [dict(result, type='transaction')]
+    
+    def _authorize(self, user_id, message):
+        # Same gate as the REST transaction routes, but a credential is mandatory on the stream
+        return transaction_service.authorize(
+            user_id,
+            verification_token=message.get('verification_token') or self.verification_token,
+            device_id=message.get('device_id') or self.device_id,
+            palm_data=message.get('palm_data'),
+            require_credentials=True
+        )
+    
+    def _ingest(self, points, dt=None):
+        # Validate up front so a bad frame never leaves the buffer and tracker half-updated
+        error = resampling_service.validate(points)
+        if error:
+            return [self._error(error)]
+        if dt is not None and (isinstance(dt, bool) or not isinstance(dt, (int, float)) or not 0 < dt < float('inf')):
+            return [self._error('dt must be a positive number')]
+        
+        events = []
+        
+        for point in points:
+            self.points.append(point[:2])
+            filtered = self.tracker.update(point, dt)
+        
+        event = {'type': 'tracking', 'point': filtered, 'count': len(self.points)}
+        if self.prediction_horizon is not None:
+            event['predicted_point'] = self.tracker.predict(self.prediction_horizon)
+        events.append(event)
+        
+        if len(self.points) >= 2 and len(self.points) % self.update_interval < len(points):
+            trajectory = resampling_service.resample(list(self.points))
+            _, gesture_type, confidence = gesture_service.score_trajectory(trajectory)
+            events.append({
+                'type': 'confidence',
+                'gesture_type': gesture_type,
+                'confidence': float(confidence)
+            })
+        
+        return events
+    
+    def _reset(self):
+        self.points.clear()
+        self.tracker.reset()
+    
+    def _error(self, message):
+        return {'type': 'error', 'success': False, 'error': message}
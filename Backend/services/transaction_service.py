@@ -3,6 +3,8 @@ from models.transaction import Transaction, transaction_repository
 from models.user import user_repository
 from utils.logger import logger
 from utils.latency_monitor import measure_latency
+from services.palm_auth_service import palm_auth_service
+from services.verification_token_service import verification_token_service
 
 class TransactionService:
     def __init__(self):
@@ -13,6 +15,23 @@ class TransactionService:
             'trade': 50000
         }
     
+    def authorize(self, user_id, verification_token=None, device_id=None, palm_data=None,
+                  require_credentials=False):
+        if verification_token:
+            if not verification_token_service.validate(verification_token, user_id, device_id):
+                return {'success': False, 'error': 'Invalid or expired verification token'}
+            return None
+        
+        if palm_data:
+            result = palm_auth_service.verify_palm(user_id, palm_data)
+            if not result['success']:
+                return result
+            return None
+        
+        if require_credentials:
+            return {'success': False, 'error': 'Verification token or palm data required'}
+        return None
+    
     @measure_latency('create_payment')
     def create_payment(self, user_id, amount, currency='USD', gesture_type=None):
         logger.info(f'Creating payment for user {user_id}: {amount} {currency}')
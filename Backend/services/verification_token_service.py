@@ -0,0 +1,124 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from utils.logger import logger
+
+class VerificationTokenService:
+    def __init__(self, secret=Config.SECRET_KEY, ttl_seconds=Config.VERIFICATION_TOKEN_TTL, max_tokens=10000):
+        self.secret = secret.encode('utf-8') if isinstance(secret, str) else secret
+        self.ttl_seconds = ttl_seconds
+        self.max_tokens = max_tokens
+        self._tokens = OrderedDict()
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.secret)
+
+    def issue(self, user_id, device_id):
+        if not self.enabled:
+            logger.warning('Refusing to issue verification token: SECRET_KEY is not configured')
+            return {'success': False, 'error': 'Verification tokens are unavailable: SECRET_KEY is not configured'}
+
+        expires_at = time.time() + self.ttl_seconds
+        payload = self._encode(json.dumps({
+            'sub': user_id,
+            'dev': device_id,
+            'exp': expires_at,
+            'jti': secrets.token_hex(8)
+        }, separators=(',', ':')).encode('utf-8'))
+        token = f'{payload}.{self._sign(payload)}'
+
+        with self._lock:
+            self._evict_expired(time.time())
+            self._tokens[token] = (user_id, device_id, expires_at)
+            while len(self._tokens) > self.max_tokens:
+                self._tokens.popitem(last=False)
+
+        return {'success': True, 'token': token, 'expires_in': self.ttl_seconds}
+
+    def validate(self, token, user_id, device_id):
+        if not self.enabled or not isinstance(token, str):
+            return False
+        if not token or not user_id or not device_id:
+            return False
+
+        now = time.time()
+        with self._lock:
+            # Checked before the signature so a revoked token stays dead after it leaves the cache
+            if token in self._revoked:
+                return False
+            claims = self._tokens.get(token)
+
+        if claims is None:
+            # Tokens issued by another worker or evicted from the cache fall back to the signature
+            claims = self._verify_signature(token)
+            if claims is None:
+                return False
+
+        token_user, token_device, expires_at = claims
+        if expires_at <= now:
+            with self._lock:
+                self._tokens.pop(token, None)
+            return False
+
+        user_matches = hmac.compare_digest(str(token_user).encode('utf-8'), str(user_id).encode('utf-8'))
+        device_matches = hmac.compare_digest(str(token_device).encode('utf-8'), str(device_id).encode('utf-8'))
+        return user_matches and device_matches
+
+    def revoke(self, token):
+        if not isinstance(token, str) or not token:
+            return False
+
+        now = time.time()
+        claims = self._verify_signature(token)
+        with self._lock:
+            cached = self._tokens.pop(token, None)
+            claims = cached or claims
+            if claims is None:
+                return False
+
+            # A revoked token only needs remembering until it would have expired anyway
+            self._revoked = {revoked: expires_at for revoked, expires_at in self._revoked.items() if expires_at > now}
+            if claims[2] > now:
+                self._revoked[token] = claims[2]
+        return True
+
+    def _verify_signature(self, token):
+        payload, _, signature = token.partition('.')
+        if not payload or not signature or not token.isascii():
+            return None
+
+        if not hmac.compare_digest(self._sign(payload), signature):
+            logger.warning('Rejected verification token with invalid signature')
+            return None
+
+        try:
+            claims = json.loads(self._decode(payload))
+            return claims['sub'], claims['dev'], float(claims['exp'])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _evict_expired(self, now):
+        # Every token shares one TTL, so insertion order is also expiry order
+        while self._tokens and next(iter(self._tokens.values()))[2] <= now:
+            self._tokens.popitem(last=False)
+
+    def _sign(self, payload):
+        digest = hmac.new(self.secret, payload.encode('ascii'), hashlib.sha256).digest()
+        return self._encode(digest)
+
+    def _encode(self, raw):
+        return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+    def _decode(self, text):
+        return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+verification_token_service = VerificationTokenService()
@@ -0,0 +1,168 @@
+import os
+import threading
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# palm_pay/ml/embedding_store.py vendors this class for the palm gateway; keep the on-disk format in step
+class MemmapEmbeddingStore:
+    TOMBSTONE = 'deleted'
+
+    def __init__(self, path, dim):
+        self.path = path
+        self.dim = dim
+        self.row_bytes = dim * np.dtype(np.float32).itemsize
+        self.matrix_path = f'{path}.f32'
+        self.ids_path = f'{path}.ids'
+
+        self._matrix = None
+        self._ids = []
+        self._rows = {}
+        self._tombstones = set()
+        self._ids_offset = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        for file_path in (self.matrix_path, self.ids_path):
+            open(file_path, 'ab').close()
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    @property
+    def generation(self):
+        # Rows ever written, tombstones included; grows with every append or removal
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    def __contains__(self, key):
+        with self._lock:
+            self._refresh()
+            return str(key) in self._rows
+
+    def append(self, key, embedding):
+        return self.append_many([key], [embedding])[0]
+
+    def append_many(self, keys, embeddings):
+        keys = [str(key) for key in keys]
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+
+        if len(keys) != len(vectors):
+            raise ValueError('keys and embeddings must have the same length')
+        if any('\n' in key or '\t' in key for key in keys):
+            raise ValueError('Embedding keys cannot contain newlines or tabs')
+
+        return self._write(keys, keys, vectors)
+
+    def remove(self, key):
+        key = str(key)
+        if key not in self:
+            return False
+
+        # Tombstones occupy a zeroed row so ids stay aligned with matrix rows
+        self._write([key], [f'{key}\t{self.TOMBSTONE}'], np.zeros((1, self.dim), dtype=np.float32))
+        return True
+
+    def _write(self, keys, lines, vectors):
+        with self._lock, open(self.ids_path, 'ab') as ids_file, open(self.matrix_path, 'ab') as matrix_file:
+            self._file_lock(ids_file, exclusive=True)
+            try:
+                self._refresh()
+
+                # Rows written by a writer that died before recording their ids are dropped
+                first_row = len(self._ids)
+                if os.fstat(matrix_file.fileno()).st_size != first_row * self.row_bytes:
+                    matrix_file.truncate(first_row * self.row_bytes)
+
+                matrix_file.write(vectors.tobytes())
+                matrix_file.flush()
+                ids_file.write(''.join(f'{line}\n' for line in lines).encode('utf-8'))
+                ids_file.flush()
+            finally:
+                self._file_lock(ids_file, exclusive=False)
+
+            self._refresh()
+            return list(range(first_row, first_row + len(keys)))
+
+    def get(self, key, limit=None):
+        with self._lock:
+            self._refresh()
+            rows = self._rows.get(str(key))
+            if not rows:
+                return None
+            if limit:
+                rows = rows[-limit:]
+            return np.array(self._matrix[rows])
+
+    def keys(self):
+        with self._lock:
+            self._refresh()
+            return list(self._rows)
+
+    def export(self):
+        with self._lock:
+            self._refresh()
+            latest = {key: rows[-1] for key, rows in self._rows.items()}
+            if not latest:
+                return [], np.empty((0, self.dim), dtype=np.float32)
+            return list(latest), self._matrix[list(latest.values())]
+
+    def changes(self, since=0):
+        # Replays rows written after generation `since`; removals come back with a None embedding
+        with self._lock:
+            self._refresh()
+            generation = len(self._ids)
+            return generation, [
+                (self._ids[row], None if row in self._tombstones else self._matrix[row])
+                for row in range(since, generation)
+            ]
+
+    def _refresh(self):
+        if os.path.getsize(self.ids_path) == self._ids_offset:
+            return
+
+        with open(self.ids_path, 'rb') as ids_file:
+            ids_file.seek(self._ids_offset)
+            chunk = ids_file.read()
+
+        # Only lines terminated by a newline are committed
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        if not complete:
+            return
+
+        for line in complete.decode('utf-8').splitlines():
+            key, _, marker = line.partition('\t')
+            if marker == self.TOMBSTONE:
+                self._rows.pop(key, None)
+                self._tombstones.add(len(self._ids))
+            else:
+                self._rows.setdefault(key, []).append(len(self._ids))
+            self._ids.append(key)
+        self._ids_offset += len(complete)
+
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r',
+                                 shape=(len(self._ids), self.dim))
+
+    def _file_lock(self, handle, exclusive):
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_UN)
+
+class EmbeddingStoreRegistry:
+    def __init__(self, directory):
+        self.directory = directory
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def for_kind(self, kind, dim):
+        with self._lock:
+            store = self._stores.get((kind, dim))
+            if store is None:
+                store = MemmapEmbeddingStore(os.path.join(self.directory, f'palm_{kind}_{dim}d'), dim)
+                self._stores[(kind, dim)] = store
+            return store
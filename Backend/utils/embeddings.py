@@ -0,0 +1,25 @@
+import numpy as np
+
+def normalize_embedding(vector, center=False):
+    if vector is None:
+        return None
+    embedding = np.asarray(vector, dtype=np.float32).ravel()
+    if center:
+        # Raw measurements share a large positive offset that would otherwise dominate the cosine
+        embedding = embedding - embedding.mean()
+    norm = np.linalg.norm(embedding)
+    if not np.isfinite(norm) or norm == 0:
+        return None
+    return embedding / norm
+
+def cosine_scores(templates, query):
+    templates = np.atleast_2d(np.asarray(templates, dtype=np.float32))
+    if templates.shape[1] != query.shape[0]:
+        return np.zeros(len(templates), dtype=np.float32)
+    # Templates and query are unit length, so this is the cosine; squared L2 distance is 2 - 2 * cosine
+    return templates @ query
+
+def best_cosine_score(templates, query):
+    if templates is None or query is None or len(templates) == 0:
+        return 0.0
+    return float(np.max(cosine_scores(templates, query)))
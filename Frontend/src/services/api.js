@@ -1,14 +1,15 @@
 const API_BASE_URL = 'http://localhost:5000/api';
+const STREAM_BASE_URL = API_BASE_URL.replace(/^http/, 'ws');
 
 class ApiService {
     async request(endpoint, options = {}) {
         const url = `${API_BASE_URL}${endpoint}`;
         const config = {
+            ...options,
             headers: {
                 'Content-Type': 'application/json',
                 ...options.headers,
             },
-            ...options,
         };
 
         try {
@@ -35,13 +36,25 @@ class ApiService {
         });
     }
 
-    async verifyPalm(userId, palmData) {
+    async verifyPalm(userId, palmData, { deviceId = null, issueToken = false } = {}) {
         return this.request('/auth/verify-palm', {
             method: 'POST',
-            body: JSON.stringify({ user_id: userId, palm_data: palmData }),
+            body: JSON.stringify({
+                user_id: userId,
+                palm_data: palmData,
+                device_id: deviceId,
+                issue_token: issueToken,
+            }),
         });
     }
 
+    verificationHeaders({ verificationToken = null, deviceId = null } = {}) {
+        if (!verificationToken) return {};
+        const headers = { 'X-Verification-Token': verificationToken };
+        if (deviceId) headers['X-Device-Id'] = deviceId;
+        return headers;
+    }
+
     async getUser(userId) {
         return this.request(`/auth/user/${userId}`, {
             method: 'GET',
@@ -55,15 +68,69 @@ class ApiService {
         });
     }
 
-    async getGestureHistory(limit = 10) {
-        return this.request(`/gesture/history?limit=${limit}`, {
+    async processGestureBatch(gestures, userId = null) {
+        return this.request('/gesture/process-batch', {
+            method: 'POST',
+            body: JSON.stringify({ gestures, user_id: userId }),
+        });
+    }
+
+    openGestureStream({ userId = null, sessionId = null, predictionHorizon = null, deviceId = null, verificationToken = null } = {}, onEvent = () => {}) {
+        // Browsers cannot set headers on a WebSocket, so credentials travel in the query and messages
+        const params = new URLSearchParams();
+        if (userId) params.set('user_id', userId);
+        if (sessionId) params.set('session_id', sessionId);
+        if (predictionHorizon !== null) params.set('prediction_horizon', predictionHorizon);
+        if (deviceId) params.set('device_id', deviceId);
+
+        const socket = new WebSocket(`${STREAM_BASE_URL}/stream/gesture?${params}`);
+        socket.onmessage = (message) => onEvent(JSON.parse(message.data));
+
+        const send = (payload) => {
+            if (socket.readyState === WebSocket.OPEN) {
+                socket.send(JSON.stringify(payload));
+            }
+        };
+
+        const withVerification = (payload, verification = {}) => {
+            const token = verification.verificationToken || verificationToken;
+            const device = verification.deviceId || deviceId;
+            return {
+                ...payload,
+                ...(token ? { verification_token: token } : {}),
+                ...(device ? { device_id: device } : {}),
+            };
+        };
+
+        return {
+            socket,
+            sendPoint: (x, y) => send({ type: 'point', x, y }),
+            sendLandmarks: (landmarks) => send({ type: 'landmarks', landmarks }),
+            endGesture: () => send({ type: 'end' }),
+            reset: () => send({ type: 'reset' }),
+            sendPayment: (amount, currency = 'USD', gestureType = null, verification = {}) =>
+                send(withVerification({ type: 'payment', amount, currency, gesture_type: gestureType }, verification)),
+            sendTrade: (asset, amount, tradeType = 'buy', gestureType = null, verification = {}) =>
+                send(withVerification({ type: 'trade', asset, amount, trade_type: tradeType, gesture_type: gestureType }, verification)),
+            close: () => socket.close(),
+        };
+    }
+
+    async getGestureHistory({ userId = null, sessionId = null, limit = 10 } = {}) {
+        // History is per user or session; the server rejects requests that name neither
+        const params = new URLSearchParams({ limit });
+        if (userId) params.set('user_id', userId);
+        if (sessionId) params.set('session_id', sessionId);
+
+        return this.request(`/gesture/history?${params}`, {
             method: 'GET',
         });
     }
 
-    async createPayment(userId, amount, currency = 'USD', gestureType = null) {
+    async createPayment(userId, amount, currency = 'USD', gestureType = null, verification = {}) {
         return this.request('/transaction/payment', {
             method: 'POST',
+            headers: this.verificationHeaders(verification),
             body: JSON.stringify({
                 user_id: userId,
                 amount,
@@ -73,9 +140,10 @@ class ApiService {
         });
     }
 
-    async createTrade(userId, asset, amount, tradeType = 'buy', gestureType = null) {
+    async createTrade(userId, asset, amount, tradeType = 'buy', gestureType = null, verification = {}) {
         return this.request('/transaction/trade', {
             method: 'POST',
+            headers: this.verificationHeaders(verification),
             body: JSON.stringify({
                 user_id: userId,
                 asset,
@@ -1,8 +1,18 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List
+import asyncio
+import io
+import os
+import threading
 import numpy as np
 from inference import BiometricAuthenticator
+from cascade_verifier import CascadeVerifier, GeometryGate
+from model_loader import ModelLoader
+from inference_executor import BoundedInferenceExecutor, ExecutorSaturated
+from model_registry import ModelRegistry, RegistryWatcher
+from shadow_scorer import ShadowScorer
 import uvicorn
 
 app = FastAPI(
@@ -11,7 +21,125 @@ app = FastAPI(
     version="2.1.0"
 )
 
-authenticator = BiometricAuthenticator()
+NUM_FEATURES = 37
+MAX_BATCH_ROWS = int(os.environ.get("PALM_MAX_BATCH_ROWS", 100000))
+NPZ_CONTENT_TYPES = ("application/x-npz", "application/octet-stream")
+
+# Concurrent requests share one forward pass; set PALM_BATCH_MAX_SIZE=1 to disable
+BATCH_MAX_SIZE = int(os.environ.get("PALM_BATCH_MAX_SIZE", 32))
+BATCH_MAX_WAIT_MS = float(os.environ.get("PALM_BATCH_MAX_WAIT_MS", 2.0))
+
+# Versions published with model_registry.py; the ACTIVE pointer is polled and hot-swapped
+registry = ModelRegistry(os.environ.get("PALM_MODEL_REGISTRY", "models/registry"))
+REGISTRY_POLL_SECONDS = float(os.environ.get("PALM_REGISTRY_POLL_SECONDS", 2.0))
+RETIRE_AFTER_SECONDS = float(os.environ.get("PALM_RETIRE_AFTER_SECONDS", 30.0))
+SHADOW_SAMPLE_RATE = float(os.environ.get("PALM_SHADOW_SAMPLE_RATE", 1.0))
+
+def load_components(model_path='models/', batching=True):
+    authenticator = BiometricAuthenticator(model_path, backend=os.environ.get("PALM_INFERENCE_BACKEND", "auto"))
+    if batching and BATCH_MAX_SIZE > 1:
+        authenticator.enable_batching(BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS)
+    
+    # Geometry bounds written by train_model.py belong to the model they were fitted with; a version
+    # without them sends every request to the model rather than borrowing another version's bounds
+    gate_path = f'{model_path}geometry_gate.npz'
+    if os.path.exists(gate_path):
+        geometry_gate = GeometryGate.load(gate_path)
+    else:
+        print(f"⚠️ No geometry gate in {model_path}; the cascade will not pre-filter requests")
+        geometry_gate = GeometryGate()
+    return authenticator, CascadeVerifier(authenticator, geometry_gate)
+
+def load_version(version, batching=True):
+    registry.verify(version)
+    return load_components(registry.path(version), batching)
+
+def load_active_components():
+    version = registry.active_version()
+    return load_version(version) if version else load_components()
+
+def retire_components(components):
+    # Runs after the grace period, so requests that picked up the old model have finished
+    authenticator, _ = components
+    if authenticator.batcher is not None:
+        authenticator.batcher.stop()
+
+def warmup_components(components):
+    authenticator, _ = components
+    
+    # One pass per shape the handlers produce, so no request pays first-call tracing
+    for rows in sorted({1, BATCH_MAX_SIZE, 4096}):
+        authenticator.predict_logits(np.zeros((rows, NUM_FEATURES), dtype=np.float32))
+    authenticator.authenticate(np.zeros(NUM_FEATURES, dtype=np.float32))
+
+model_loader = ModelLoader(
+    load_active_components,
+    warmup_components,
+    retire=retire_components,
+    retire_after=RETIRE_AFTER_SECONDS,
+    version=registry.active_version()
+)
+
+shadow_scorer = ShadowScorer(sample_rate=SHADOW_SAMPLE_RATE)
+
+def unbatched_components(components):
+    # The shadow candidate runs unbatched, so the primary is re-timed the same way
+    authenticator, verifier = components
+    authenticator = authenticator.unbatched()
+    return authenticator, CascadeVerifier(authenticator, verifier.gate)
+
+def load_shadow_candidate(version):
+    try:
+        components = None
+        if version is not None:
+            components = load_version(version, batching=False)
+            warmup_components(components)
+    except Exception as error:
+        print(f"⚠️ Shadow candidate {version} failed to load: {type(error).__name__}: {error}")
+        return
+    
+    previous = shadow_scorer.set_candidate(components, version)
+    if previous is not None:
+        retire_components(previous)
+
+def on_active_version(version):
+    model_loader.swap(lambda: load_version(version), version)
+
+def on_candidate_version(version):
+    threading.Thread(target=load_shadow_candidate, args=(version,), name='palm-shadow-loader', daemon=True).start()
+
+registry_watcher = RegistryWatcher(registry, on_active_version, on_candidate_version, REGISTRY_POLL_SECONDS)
+
+# Inference runs on its own sized pool; workers block on the micro-batcher, so keep at least one per batch slot
+inference_executor = BoundedInferenceExecutor(
+    max_workers=int(os.environ.get("PALM_INFERENCE_WORKERS", max(BATCH_MAX_SIZE, 4))),
+    max_queue=int(os.environ.get("PALM_INFERENCE_QUEUE", 256))
+)
+
+async def run_inference(fn, *args, shadow=None, components=None):
+    try:
+        future = inference_executor.submit(fn, *args)
+    except ExecutorSaturated as saturated:
+        raise HTTPException(
+            status_code=429,
+            detail="Inference queue is full",
+            headers={"Retry-After": str(saturated.retry_after)}
+        )
+    
+    result = await asyncio.wrap_future(future)
+    if shadow is not None and shadow_scorer.active:
+        shadow_scorer.observe(shadow, args, result, unbatched_components(components))
+    return result
+
+def require_model():
+    components = model_loader.get()
+    if components is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Model not ready ({model_loader.status})",
+            headers={"Retry-After": "1"}
+        )
+    return components
 
 class AuthRequest(BaseModel):
     features: List[float]
@@ -21,6 +149,7 @@ class VerifyRequest(BaseModel):
     features: List[float]
     user_id: int
     threshold: float = 0.85
+    top_k: int = 0
 
 @app.get("/")
 def root():
@@ -31,39 +160,160 @@ def root():
     }
 
 @app.post("/authenticate")
-def authenticate(request: AuthRequest):
-    if len(request.features) != 37:
+async def authenticate(request: AuthRequest):
+    if len(request.features) != NUM_FEATURES:
         raise HTTPException(
             status_code=400,
             detail="Expected 37 features"
         )
     
-    result = authenticator.authenticate(
+    components = require_model()
+    authenticator, _ = components
+    result = await run_inference(
+        authenticator.authenticate,
         request.features,
-        request.threshold
+        request.threshold,
+        shadow="authenticate",
+        components=components
     )
     
     return result
 
 @app.post("/verify")
-def verify(request: VerifyRequest):
-    if len(request.features) != 37:
+async def verify(request: VerifyRequest):
+    if len(request.features) != NUM_FEATURES:
         raise HTTPException(
             status_code=400,
             detail="Expected 37 features"
         )
     
-    result = authenticator.verify(
+    components = require_model()
+    _, verifier = components
+    if not 0 <= request.top_k <= 100:
+        raise HTTPException(
+            status_code=400,
+            detail="top_k must be between 0 and 100"
+        )
+    
+    result = await run_inference(
+        verifier.verify,
         request.features,
         request.user_id,
-        request.threshold
+        request.threshold,
+        request.top_k,
+        shadow="verify",
+        components=components
     )
     
     return result
 
+async def read_feature_batch(request: Request, require_user_ids=False):
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    
+    try:
+        if content_type in NPZ_CONTENT_TYPES:
+            # Compact encoding: np.savez(features=float32 (N, 37), user_ids=int (N,))
+            with np.load(io.BytesIO(body), allow_pickle=False) as payload:
+                features = payload["features"]
+                user_ids = payload["user_ids"] if "user_ids" in payload.files else None
+            threshold = float(request.query_params.get("threshold", 0.85))
+        else:
+            payload = await request.json()
+            features = payload.get("features")
+            user_ids = payload.get("user_ids")
+            threshold = float(payload.get("threshold", 0.85))
+        
+        features = np.asarray(features, dtype=np.float32)
+        if user_ids is not None:
+            user_ids = np.asarray(user_ids, dtype=np.int64)
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise HTTPException(status_code=400, detail="Malformed batch payload")
+    
+    if features.ndim != 2 or features.shape[1] != NUM_FEATURES:
+        raise HTTPException(status_code=400, detail=f"Expected a matrix of shape (N, {NUM_FEATURES})")
+    if not 0 < len(features) <= MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch must contain 1-{MAX_BATCH_ROWS} rows")
+    if not np.isfinite(features).all():
+        raise HTTPException(status_code=400, detail="Features must be finite")
+    if require_user_ids and (user_ids is None or user_ids.shape != (len(features),)):
+        raise HTTPException(status_code=400, detail="Expected one user_id per feature row")
+    
+    return features, user_ids, threshold
+
+@app.post("/authenticate/batch")
+async def authenticate_batch(request: Request):
+    authenticator, _ = require_model()
+    features, _, threshold = await read_feature_batch(request)
+    return await run_inference(authenticator.authenticate_batch, features, threshold)
+
+@app.post("/verify/batch")
+async def verify_batch(request: Request):
+    _, verifier = require_model()
+    features, user_ids, threshold = await read_feature_batch(request, require_user_ids=True)
+    return await run_inference(verifier.verify_batch, features, user_ids, threshold)
+
+@app.get("/stats/batching")
+def batching_stats():
+    authenticator, _ = require_model()
+    if authenticator.batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **authenticator.batcher.stats()}
+
+@app.get("/stats/inference")
+def inference_stats():
+    return inference_executor.stats()
+
+@app.get("/stats/shadow")
+def shadow_stats():
+    return shadow_scorer.stats()
+
+@app.get("/models")
+def model_versions():
+    return {
+        "serving": model_loader.version,
+        "active": registry.active_version(),
+        "candidate": registry.candidate_version(),
+        "versions": registry.versions()
+    }
+
+@app.on_event("startup")
+def start_model_loading():
+    # Load in the background so uvicorn binds immediately; readiness flips when warm
+    model_loader.start()
+    registry_watcher.start()
+    if registry_watcher.candidate is not None:
+        on_candidate_version(registry_watcher.candidate)
+
+@app.on_event("shutdown")
+def stop_batcher():
+    registry_watcher.stop()
+    shadow_scorer.shutdown()
+    inference_executor.shutdown()
+    components = model_loader.get()
+    if components is not None:
+        retire_components(components)
+
+@app.get("/stats/cascade")
+def cascade_stats():
+    _, verifier = require_model()
+    return verifier.stats()
+
+@app.get("/health/live")
+def liveness():
+    return {"status": "alive"}
+
 @app.get("/health")
 def health_check():
+    # Unchanged for existing callers: 200 while the process is up, even if the model is still loading
     return {"status": "healthy"}
 
+@app.get("/health/ready")
+def readiness():
+    state = model_loader.state()
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "unavailable", **state})
+    return {"status": "healthy", **state}
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
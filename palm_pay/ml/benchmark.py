@@ -0,0 +1,171 @@
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+from inference import BiometricAuthenticator
+from generate_dataset import generate_palm_chunks
+
+BACKENDS = ('numpy', 'int8', 'keras')
+BACKEND_FILES = {
+    'numpy': ('palm_biometric_model.npz',),
+    'int8': ('palm_biometric_model_int8.npz',),
+    'keras': ('palm_biometric_model.h5', 'scaler.pkl')
+}
+BATCH_SIZES = (1, 8, 32, 128, 512, 4096)
+
+
+def synthetic_features(num_samples=2000, num_users=100):
+    _, _, features = next(generate_palm_chunks(num_samples, num_users, noise_ratio=0.0, chunk_size=num_samples))
+    return features
+
+
+def available_backends(model_path='models/'):
+    return [
+        backend for backend in BACKENDS
+        if all(os.path.exists(f'{model_path}{name}') for name in BACKEND_FILES[backend])
+    ]
+
+
+def model_size_bytes(backend, model_path='models/'):
+    return sum(os.path.getsize(f'{model_path}{name}') for name in BACKEND_FILES[backend])
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_cold_start(backend, model_path='models/', num_features=37):
+    start_time = time.perf_counter()
+    authenticator = BiometricAuthenticator(model_path, backend=backend)
+    load_ms = (time.perf_counter() - start_time) * 1000
+
+    start_time = time.perf_counter()
+    authenticator.authenticate(np.zeros(num_features, dtype=np.float32))
+    first_request_ms = (time.perf_counter() - start_time) * 1000
+
+    return {
+        'load_ms': load_ms,
+        'first_request_ms': first_request_ms,
+        'cold_start_ms': load_ms + first_request_ms,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def cold_start_in_subprocess(backend, model_path='models/'):
+    # A fresh interpreter, so import and allocation costs are not hidden by earlier backends
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--cold-start', backend, model_path],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_latency(authenticator, features, iterations=1000, warmup=50):
+    for row in features[:warmup]:
+        authenticator.authenticate(row)
+
+    latencies = np.empty(iterations)
+    for i in range(iterations):
+        row = features[i % len(features)]
+        start_time = time.perf_counter()
+        authenticator.authenticate(row)
+        latencies[i] = (time.perf_counter() - start_time) * 1000
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'iterations': iterations,
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(latencies.max()),
+        'requests_per_s': float(1000 / latencies.mean())
+    }
+
+
+def measure_throughput(authenticator, features, batch_sizes=BATCH_SIZES, min_time_s=0.5):
+    curve = []
+    for batch_size in batch_sizes:
+        batch = np.resize(features, (batch_size, features.shape[1]))
+        authenticator.predict_logits(batch)
+
+        # Repeat until the timing window is long enough to be stable
+        iterations = 0
+        start_time = time.perf_counter()
+        while True:
+            authenticator.predict_logits(batch)
+            iterations += 1
+            elapsed = time.perf_counter() - start_time
+            if elapsed >= min_time_s:
+                break
+
+        batch_ms = elapsed / iterations * 1000
+        curve.append({
+            'batch_size': batch_size,
+            'batch_ms': batch_ms,
+            'samples_per_s': batch_size * 1000 / batch_ms
+        })
+
+    return curve
+
+
+def benchmark_backend(backend, features, model_path='models/', iterations=1000, batch_sizes=BATCH_SIZES):
+    cold_start = cold_start_in_subprocess(backend, model_path)
+    authenticator = BiometricAuthenticator(model_path, backend=backend)
+
+    throughput = measure_throughput(authenticator, features, batch_sizes)
+    return {
+        'model_size_mb': model_size_bytes(backend, model_path) / (1024 * 1024),
+        'cold_start': cold_start,
+        'latency': measure_latency(authenticator, features, iterations),
+        'throughput': throughput,
+        'peak_samples_per_s': max(point['samples_per_s'] for point in throughput)
+    }
+
+
+def run_benchmarks(model_path='models/', output_path='reports/benchmark_results.json',
+                   features=None, backends=None, iterations=1000):
+    features = synthetic_features() if features is None else np.asarray(features, dtype=np.float32)
+    backends = available_backends(model_path) if backends is None else backends
+
+    results = {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'num_features': int(features.shape[1]),
+        'cpu_count': os.cpu_count(),
+        'backends': {}
+    }
+
+    for backend in backends:
+        print(f"⏱️ Benchmarking {backend} backend...")
+        results['backends'][backend] = benchmark_backend(backend, features, model_path, iterations)
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--cold-start':
+        print(json.dumps(measure_cold_start(sys.argv[2], sys.argv[3])))
+        sys.exit(0)
+
+    print("🚀 Inference Benchmark Suite")
+    print("=" * 50)
+
+    results = run_benchmarks()
+    for backend, row in results['backends'].items():
+        latency = row['latency']
+        print(f"\n{backend}:")
+        print(f"  Latency p50/p95/p99: {latency['p50_ms']:.3f} / {latency['p95_ms']:.3f} / {latency['p99_ms']:.3f} ms")
+        print(f"  Single-request throughput: {latency['requests_per_s']:.0f} requests/s")
+        print(f"  Peak batch throughput: {row['peak_samples_per_s']:.0f} samples/s")
+        print(f"  Cold start: {row['cold_start']['cold_start_ms']:.1f} ms, peak RSS {row['cold_start']['peak_rss_mb']:.1f} MB")
+        print(f"  Model size: {row['model_size_mb']:.2f} MB")
+
+    print("\n✅ Results saved to reports/benchmark_results.json")
@@ -0,0 +1,218 @@
+import json
+import threading
+import time
+import numpy as np
+
+# Feature vector layout: palm width/height (0-1), finger lengths (2-6), segment ratios (7-11)
+PALM_WIDTH, PALM_HEIGHT = 0, 1
+FINGER_LENGTHS = slice(2, 7)
+SEGMENT_RATIOS = slice(7, 12)
+
+
+def geometry_ratios(features, eps=1e-6):
+    features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+    palm_height = np.maximum(np.abs(features[:, PALM_HEIGHT:PALM_HEIGHT + 1]), eps)
+
+    ratios = np.hstack([
+        features[:, PALM_WIDTH:PALM_WIDTH + 1] / palm_height,
+        features[:, FINGER_LENGTHS] / palm_height,
+        features[:, SEGMENT_RATIOS]
+    ])
+    # arctan keeps ratios with near-zero denominators from dominating the bounds
+    return np.arctan(ratios)
+
+
+class GeometryGate:
+    def __init__(self, num_std=6.0, min_std=1e-3, min_samples=3):
+        self.num_std = num_std
+        self.min_std = min_std
+        self.min_samples = min_samples
+        self.lower = {}
+        self.upper = {}
+
+    def __len__(self):
+        return len(self.lower)
+
+    def __contains__(self, user_id):
+        return user_id in self.lower
+
+    def fit(self, features, user_ids):
+        ratios = geometry_ratios(features)
+        user_ids = np.asarray(user_ids)
+
+        order = np.argsort(user_ids, kind='stable')
+        users, starts, counts = np.unique(user_ids[order], return_index=True, return_counts=True)
+        sorted_ratios = ratios[order]
+
+        means = np.add.reduceat(sorted_ratios, starts, axis=0) / counts[:, None]
+        variances = np.add.reduceat(sorted_ratios ** 2, starts, axis=0) / counts[:, None] - means ** 2
+        stds = np.sqrt(np.maximum(variances, 0))
+
+        for user_id, count, mean, std in zip(users.tolist(), counts, means, stds):
+            if count >= self.min_samples:
+                self._set_bounds(user_id, mean, std)
+        return self
+
+    def enroll(self, user_id, samples):
+        ratios = geometry_ratios(samples)
+        if len(ratios) < self.min_samples:
+            return False
+
+        self._set_bounds(user_id, ratios.mean(axis=0), ratios.std(axis=0))
+        return True
+
+    def check(self, features, user_id):
+        lower = self.lower.get(user_id)
+        if lower is None:
+            return None
+
+        ratios = geometry_ratios(features)[0]
+        return bool(np.all(ratios >= lower) and np.all(ratios <= self.upper[user_id]))
+
+    def check_batch(self, features, user_ids):
+        # Vectorized check: True where the claimed user has bounds and any ratio falls outside them
+        user_ids = np.asarray(user_ids)
+        rejected = np.zeros(len(user_ids), dtype=bool)
+        if not self.lower or len(user_ids) == 0:
+            return rejected
+
+        users, inverse = np.unique(user_ids, return_inverse=True)
+        gated_users = [user_id for user_id in users.tolist() if user_id in self.lower]
+        if not gated_users:
+            return rejected
+
+        # Position of each unique user among the gated ones, -1 where the user has no bounds
+        positions = np.full(len(users), -1)
+        positions[np.isin(users, gated_users)] = np.arange(len(gated_users))
+        row_positions = positions[inverse]
+        gated = row_positions >= 0
+
+        ratios = geometry_ratios(np.asarray(features)[gated])
+        lower = np.stack([self.lower[user_id] for user_id in gated_users])[row_positions[gated]]
+        upper = np.stack([self.upper[user_id] for user_id in gated_users])[row_positions[gated]]
+        rejected[gated] = np.any((ratios < lower) | (ratios > upper), axis=1)
+        return rejected
+
+    def save(self, path):
+        user_ids = list(self.lower)
+        np.savez(
+            path,
+            lower=np.array([self.lower[u] for u in user_ids]),
+            upper=np.array([self.upper[u] for u in user_ids]),
+            ids=np.array(json.dumps(user_ids)),
+            params=np.array(json.dumps({
+                'num_std': self.num_std,
+                'min_std': self.min_std,
+                'min_samples': self.min_samples
+            }))
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        gate = cls(**json.loads(str(data['params'])))
+        user_ids = json.loads(str(data['ids']))
+        gate.lower = dict(zip(user_ids, data['lower']))
+        gate.upper = dict(zip(user_ids, data['upper']))
+        return gate
+
+    def _set_bounds(self, user_id, mean, std):
+        spread = self.num_std * np.maximum(std, self.min_std)
+        self.lower[user_id] = mean - spread
+        self.upper[user_id] = mean + spread
+
+
+class CascadeVerifier:
+    STAGES = ('geometry_rejected', 'model_verified', 'model_rejected')
+
+    def __init__(self, authenticator, gate):
+        self.authenticator = authenticator
+        self.gate = gate
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def verify(self, features, claimed_user_id, threshold=0.85, top_k=0):
+        start_time = time.perf_counter()
+        plausible = self.gate.check(features, claimed_user_id)
+
+        if plausible is False:
+            gate_time = (time.perf_counter() - start_time) * 1000
+            self._record('geometry_rejected', gate_time)
+            return {
+                'verified': False,
+                'confidence': 0.0,
+                'margin': None,
+                'stage': 'geometry',
+                'inference_time_ms': round(gate_time, 4)
+            }
+
+        result = self.authenticator.verify(features, claimed_user_id, threshold, top_k)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        self._record('model_verified' if result['verified'] else 'model_rejected', elapsed)
+
+        return {**result, 'stage': 'model'}
+
+    def verify_batch(self, features_batch, claimed_user_ids, threshold=0.85):
+        start_time = time.perf_counter()
+        features_batch = np.asarray(features_batch, dtype=np.float32)
+        claimed_user_ids = np.asarray(claimed_user_ids, dtype=np.int64)
+        count = len(features_batch)
+
+        # Rows the gate rejects never reach the model, as in verify()
+        rejected = self.gate.check_batch(features_batch, claimed_user_ids)
+        passed = np.flatnonzero(~rejected)
+
+        verified = [False] * count
+        confidence = [0.0] * count
+        margin = [None] * count
+        if len(passed):
+            result = self.authenticator.verify_batch(features_batch[passed], claimed_user_ids[passed], threshold)
+            for row, row_verified, row_confidence, row_margin in zip(
+                    passed.tolist(), result['verified'], result['confidence'], result['margin']):
+                verified[row] = row_verified
+                confidence[row] = row_confidence
+                margin[row] = row_margin
+
+        elapsed = (time.perf_counter() - start_time) * 1000
+        per_row = elapsed / max(count, 1)
+        model_verified = sum(verified)
+        self._record('geometry_rejected', per_row, int(rejected.sum()))
+        self._record('model_verified', per_row, model_verified)
+        self._record('model_rejected', per_row, len(passed) - model_verified)
+
+        return {
+            'verified': verified,
+            'confidence': confidence,
+            'margin': margin,
+            'stage': np.where(rejected, 'geometry', 'model').tolist(),
+            'threshold': threshold,
+            'count': count,
+            'inference_time_ms': round(elapsed, 2)
+        }
+
+    def stats(self):
+        with self._lock:
+            total = sum(self._counts.values())
+            return {
+                'total': total,
+                'stages': {
+                    stage: {
+                        'count': self._counts[stage],
+                        'fraction': self._counts[stage] / total if total else 0.0,
+                        'avg_latency_ms': self._latency[stage] / self._counts[stage] if self._counts[stage] else 0.0
+                    }
+                    for stage in self.STAGES
+                },
+                'gated_users': len(self.gate)
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts = {stage: 0 for stage in self.STAGES}
+            self._latency = {stage: 0.0 for stage in self.STAGES}
+
+    def _record(self, stage, latency_ms, count=1):
+        # Batches record their amortized per-row latency once per row
+        with self._lock:
+            self._counts[stage] += count
+            self._latency[stage] += latency_ms * count
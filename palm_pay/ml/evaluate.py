@@ -7,6 +7,10 @@ from sklearn.metrics import (
     roc_curve, auc, precision_recall_curve
 )
 import json
+import os
+from numpy_inference import NumpyPalmModel, softmax
+from quantization import QuantizedPalmModel, float_model_bytes
+from generate_dataset import load_dataset, split_dataset
 
 def plot_training_history(history_path='models/training_history.json'):
     with open(history_path, 'r') as f:
@@ -75,7 +79,7 @@ def calculate_far(y_true, y_pred):
     return false_accepts / total_attempts
 
 def calculate_frr(y_true, y_pred):
-    false_rejects = np.sum((y_true == y_pred) & (y_pred == -1))
+    false_rejects = np.sum((y_true != -1) & (y_pred == -1))
     total_genuine = np.sum(y_true != -1)
     return false_rejects / total_genuine if total_genuine > 0 else 0
 
@@ -109,7 +113,48 @@ def analyze_feature_importance(model, feature_names):
     
     return feature_importance
 
-def generate_performance_report(metrics):
+def load_benchmark_results(path='reports/benchmark_results.json', backend=None):
+    if not os.path.exists(path):
+        return None
+    
+    with open(path, 'r') as f:
+        results = json.load(f)
+    
+    backends = results['backends']
+    if not backends:
+        return None
+    
+    # Default to the backend inference.py picks on its own
+    if backend is None:
+        backend = 'numpy' if 'numpy' in backends else next(iter(backends))
+    return {'backend': backend, **backends[backend]}
+
+def format_benchmarks(benchmark):
+    if benchmark is None:
+        return "- Not measured yet; run `python benchmark.py` to record latency, throughput and memory\n", "n/a"
+    
+    latency = benchmark['latency']
+    lines = [
+        f"- **Backend**: {benchmark['backend']}",
+        f"- **Inference Time**: {latency['mean_ms']:.2f}ms average "
+        f"(p50 {latency['p50_ms']:.2f}ms, p95 {latency['p95_ms']:.2f}ms, p99 {latency['p99_ms']:.2f}ms)",
+        f"- **Throughput**: {latency['requests_per_s']:.0f} requests/second single-request, "
+        f"{benchmark['peak_samples_per_s']:.0f} samples/second batched",
+        f"- **Model Size**: {benchmark['model_size_mb']:.2f} MB",
+        f"- **Memory Usage**: {benchmark['cold_start']['peak_rss_mb']:.0f} MB peak RSS",
+        f"- **Cold Start**: {benchmark['cold_start']['cold_start_ms']:.0f}ms (load + first request)",
+        "",
+        "| Batch Size | Batch Time | Samples/second |",
+        "|------------|------------|----------------|"
+    ]
+    lines += [
+        f"| {point['batch_size']} | {point['batch_ms']:.3f}ms | {point['samples_per_s']:.0f} |"
+        for point in benchmark['throughput']
+    ]
+    return "\n".join(lines) + "\n", f"{latency['mean_ms']:.2f}ms"
+
+def generate_performance_report(metrics, benchmark_path='reports/benchmark_results.json'):
+    benchmark_section, inference_time = format_benchmarks(load_benchmark_results(benchmark_path))
     report = f"""
 # PalmPay Biometric Model Performance Report
 
@@ -125,18 +170,14 @@ def generate_performance_report(metrics):
 - **Equal Error Rate (EER)**: {metrics['eer']:.4f}
 
 ## Performance Benchmarks
-- **Inference Time**: 45ms (average)
-- **Throughput**: 22 requests/second
-- **Model Size**: 2.4 MB
-- **Memory Usage**: 156 MB
-
+{benchmark_section}
 ## Comparison with Industry Standards
 | Metric | PalmPay | Industry Average |
 |--------|---------|------------------|
 | Accuracy | 99.2% | 95-98% |
 | FAR | 0.01% | 0.1-1% |
 | FRR | 0.8% | 1-3% |
-| Inference Time | 45ms | 50-100ms |
+| Inference Time | {inference_time} | 50-100ms |
 
 ## Recommendations
 ✅ Model meets production requirements
@@ -151,7 +192,89 @@ Generated: {pd.Timestamp.now()}
     
     print("✅ Performance report generated")
 
+def predict_with_rejection(model, X, threshold=0.85, temperature=1.0):
+    # Same calibrated scores the API thresholds, so FAR/FRR match what it would decide
+    probabilities = softmax(model.logits(X) / temperature)
+    y_pred = probabilities.argmax(axis=1)
+    y_pred[probabilities.max(axis=1) < threshold] = -1
+    return y_pred
+
+def compare_quantized_model(float_model, quantized_model, X, y, threshold=0.85, temperature=1.0):
+    predictions = {}
+    comparison = {}
+    float_size = float_model_bytes(float_model)
+    
+    # INT8 only shrinks the file; its weights are widened to float32 once loaded
+    for name, model, stored, resident in (('float32', float_model, float_size, float_size),
+                                          ('int8', quantized_model, quantized_model.storage_nbytes,
+                                           quantized_model.nbytes)):
+        y_pred = predict_with_rejection(model, X, threshold, temperature)
+        predictions[name] = y_pred
+        comparison[name] = {
+            'accuracy': float(np.mean(y_pred == y)),
+            'far': float(calculate_far(y, y_pred)),
+            'frr': float(calculate_frr(y, y_pred)),
+            'stored_kb': stored / 1024,
+            'resident_kb': resident / 1024
+        }
+    
+    comparison['agreement'] = float(np.mean(predictions['float32'] == predictions['int8']))
+    comparison['storage_compression'] = comparison['float32']['stored_kb'] / comparison['int8']['stored_kb']
+    comparison['temperature'] = temperature
+    return comparison
+
+def generate_quantization_report(comparison, save_path='reports/quantization_report.md'):
+    float_metrics = comparison['float32']
+    int8_metrics = comparison['int8']
+    
+    report = f"""
+# PalmPay INT8 Quantization Report
+
+| Metric | Float32 | INT8 |
+|--------|---------|------|
+| Accuracy | {float_metrics['accuracy']:.4f} | {int8_metrics['accuracy']:.4f} |
+| FAR | {float_metrics['far']:.4f} | {int8_metrics['far']:.4f} |
+| FRR | {float_metrics['frr']:.4f} | {int8_metrics['frr']:.4f} |
+| Weights on disk | {float_metrics['stored_kb']:.1f} KB | {int8_metrics['stored_kb']:.1f} KB |
+| Weights in memory | {float_metrics['resident_kb']:.1f} KB | {int8_metrics['resident_kb']:.1f} KB |
+
+- **Decision agreement**: {comparison['agreement']:.4f}
+- **Storage compression**: {comparison['storage_compression']:.1f}x (on disk only; INT8 weights are widened to float32 in memory, so runtime memory and speed do not improve)
+- **Softmax temperature**: {comparison['temperature']:.3f}
+
+Generated: {pd.Timestamp.now()}
+"""
+    
+    with open(save_path, 'w') as f:
+        f.write(report)
+    
+    print(f"✅ Quantization report saved to {save_path}")
+
+def evaluate_quantization(dataset_path='data/palm_dataset.csv', model_path='models/', threshold=0.85):
+    # Only the held-out test split; training rows also fed quantization calibration
+    X, y = load_dataset(dataset_path)
+    _, _, X_test, _, _, y_test = split_dataset(X, y)
+    X_test = np.asarray(X_test, dtype=np.float32)
+    
+    float_model = NumpyPalmModel.load(f'{model_path}palm_biometric_model.npz')
+    quantized_model = QuantizedPalmModel.load(f'{model_path}palm_biometric_model_int8.npz')
+    
+    with open(f'{model_path}config.json', 'r') as f:
+        temperature = float(json.load(f).get('calibration', {}).get('temperature', 1.0))
+    
+    comparison = compare_quantized_model(float_model, quantized_model, X_test, y_test, threshold, temperature)
+    generate_quantization_report(comparison)
+    return comparison
+
 if __name__ == '__main__':
     print("📊 Model Evaluation and Analysis")
     print("=" * 50)
-    print("Run this after training to generate full analysis")
+    
+    if os.path.exists('models/palm_biometric_model_int8.npz'):
+        comparison = evaluate_quantization()
+        print(f"Float32 accuracy/FAR/FRR: {comparison['float32']['accuracy']:.4f} / "
+              f"{comparison['float32']['far']:.4f} / {comparison['float32']['frr']:.4f}")
+        print(f"INT8 accuracy/FAR/FRR: {comparison['int8']['accuracy']:.4f} / "
+              f"{comparison['int8']['far']:.4f} / {comparison['int8']['frr']:.4f}")
+    else:
+        print("Run this after training to generate full analysis")
@@ -1,82 +1,199 @@
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-import random
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-def generate_palm_features(num_samples=10000, num_users=1000):
-    print(f"🔄 Generating {num_samples} samples for {num_users} users...")
-    
-    data = []
-    samples_per_user = num_samples // num_users
-    
-    for user_id in range(num_users):
-        base_features = np.random.rand(37)
-        
-        for sample in range(samples_per_user):
-            variation = np.random.normal(0, 0.05, 37)
-            features = base_features + variation
-            features = np.clip(features, 0, 1)
-            
-            timestamp = datetime.now() - timedelta(
-                days=random.randint(0, 365),
-                hours=random.randint(0, 23),
-                minutes=random.randint(0, 59)
-            )
-            
-            sample_data = {
-                'user_id': user_id,
-                'timestamp': timestamp.isoformat()
-            }
-            
-            for i, feature in enumerate(features):
-                sample_data[f'feature_{i}'] = feature
-            
-            data.append(sample_data)
-        
-        if (user_id + 1) % 100 == 0:
-            print(f"  Generated data for {user_id + 1}/{num_users} users")
-    
-    df = pd.DataFrame(data)
+NUM_FEATURES = 37
+FEATURE_NOISE_STD = 0.05
+TIMESTAMP_RANGE_MINUTES = 366 * 24 * 60
+BLOCK_ROWS = 65536
+FEATURE_COLUMNS = [f'feature_{i}' for i in range(NUM_FEATURES)]
+
+def _fill_block(seed, chunk_index, block_index, user_ids, features, timestamps, base_features, now):
+    # Each block has its own seed, so output depends only on seed and chunk_size, not on thread count
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index, block_index)))
+
+    rng.standard_normal(out=features, dtype=np.float32)
+    features *= FEATURE_NOISE_STD
+    # Noise rows (user_id -1) pick up the all-zero last row of base_features
+    features += base_features[user_ids]
+
+    noise = np.flatnonzero(user_ids == -1)
+    features[noise] = rng.random((len(noise), NUM_FEATURES), dtype=np.float32)
+    np.clip(features, 0, 1, out=features)
+
+    timestamps[:] = now - rng.integers(0, TIMESTAMP_RANGE_MINUTES, len(timestamps)) * 60
+    timestamps[noise] = now
+
+def generate_palm_chunks(num_samples=50000, num_users=1000, noise_ratio=0.05, chunk_size=1_000_000, seed=42):
+    base_features = np.zeros((num_users + 1, NUM_FEATURES), dtype=np.float32)
+    np.random.default_rng(seed).random(out=base_features[:num_users], dtype=np.float32)
+    now = np.int64(time.time())
+
+    num_genuine = (num_samples // num_users) * num_users
+    num_noise = int(num_genuine * noise_ratio)
+    total = num_genuine + num_noise
+
+    genuine_done = 0
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        for chunk_index, start in enumerate(range(0, total, chunk_size)):
+            size = min(chunk_size, total - start)
+
+            # Noise rows are spread across chunks in proportion, so every chunk has the same mix
+            genuine_end = (start + size) * num_genuine // total
+            user_ids = np.full(size, -1, dtype=np.int32)
+            user_ids[:genuine_end - genuine_done] = np.arange(genuine_done, genuine_end) % num_users
+            genuine_done = genuine_end
+
+            # Shuffle the labels only; features are then generated directly in shuffled order
+            chunk_rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+            chunk_rng.shuffle(user_ids)
+
+            features = np.empty((size, NUM_FEATURES), dtype=np.float32)
+            timestamps = np.empty(size, dtype=np.int64)
+            blocks = [
+                executor.submit(_fill_block, seed, chunk_index, block_index,
+                                user_ids[lo:lo + BLOCK_ROWS], features[lo:lo + BLOCK_ROWS],
+                                timestamps[lo:lo + BLOCK_ROWS], base_features, now)
+                for block_index, lo in enumerate(range(0, size, BLOCK_ROWS))
+            ]
+            for block in blocks:
+                block.result()
+
+            yield user_ids, timestamps, features
+
+def write_npy_dataset(output_dir, num_samples=50000, num_users=1000, noise_ratio=0.05, chunk_size=1_000_000, seed=42):
+    os.makedirs(output_dir, exist_ok=True)
+
+    num_genuine = (num_samples // num_users) * num_users
+    total = num_genuine + int(num_genuine * noise_ratio)
+    columns = {
+        'user_ids': (np.dtype(np.int32), (total,)),
+        'timestamps': (np.dtype(np.int64), (total,)),
+        'features': (np.dtype(np.float32), (total, NUM_FEATURES))
+    }
+
+    # Header first, then each chunk is appended raw: one sequential write per column per chunk
+    files = {}
+    try:
+        for name, (dtype, shape) in columns.items():
+            files[name] = open(os.path.join(output_dir, f'{name}.npy'), 'wb')
+            np.lib.format.write_array_header_1_0(files[name], {
+                'descr': np.lib.format.dtype_to_descr(dtype),
+                'fortran_order': False,
+                'shape': shape
+            })
+
+        written = 0
+        for user_ids, timestamps, features in generate_palm_chunks(num_samples, num_users, noise_ratio, chunk_size, seed):
+            files['user_ids'].write(user_ids.data)
+            files['timestamps'].write(timestamps.data)
+            files['features'].write(features.data)
+            written += len(user_ids)
+            print(f"  Wrote {written}/{total} samples")
+    finally:
+        for f in files.values():
+            f.close()
+
+    return total
+
+def load_npy_dataset(dataset_dir, mmap=True):
+    mmap_mode = 'r' if mmap else None
+    X = np.load(os.path.join(dataset_dir, 'features.npy'), mmap_mode=mmap_mode)
+    y = np.load(os.path.join(dataset_dir, 'user_ids.npy'), mmap_mode=mmap_mode)
+    return X, y
+
+def load_dataset(dataset_path='data/palm_dataset.csv'):
+    # Directories hold the .npy columns written by `--format npy`
+    if os.path.isdir(dataset_path):
+        return load_npy_dataset(dataset_path, mmap=False)
+
+    import pandas as pd
+
+    df = pd.read_csv(dataset_path)
+    X = df.drop(['user_id', 'timestamp'], axis=1).values
+    y = df['user_id'].values
+    return X, y
+
+def split_dataset(X, y, seed=42):
+    # 70/15/15 stratified train/validation/test; evaluation scripts re-derive the same held-out rows
+    from sklearn.model_selection import train_test_split
+
+    X_train, X_temp, y_train, y_temp = train_test_split(
+        X, y, test_size=0.3, random_state=seed, stratify=y
+    )
+    X_val, X_test, y_val, y_test = train_test_split(
+        X_temp, y_temp, test_size=0.5, random_state=seed, stratify=y_temp
+    )
+    return X_train, X_val, X_test, y_train, y_val, y_test
+
+def chunk_to_frame(user_ids, timestamps, features):
+    import pandas as pd
+
+    df = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+    df.insert(0, 'timestamp', np.datetime_as_string(timestamps.astype('datetime64[s]')))
+    df.insert(0, 'user_id', user_ids)
     return df
 
-def add_noise_samples(df, noise_ratio=0.05):
+def generate_palm_features(num_samples=10000, num_users=1000, seed=42):
+    import pandas as pd
+
+    print(f"🔄 Generating {num_samples} samples for {num_users} users...")
+    chunks = generate_palm_chunks(num_samples, num_users, noise_ratio=0.0, seed=seed)
+    return pd.concat([chunk_to_frame(*chunk) for chunk in chunks], ignore_index=True)
+
+def add_noise_samples(df, noise_ratio=0.05, seed=42):
+    import pandas as pd
+
     num_noise = int(len(df) * noise_ratio)
     print(f"🔄 Adding {num_noise} noise samples...")
-    
-    noise_data = []
-    for _ in range(num_noise):
-        sample = {
-            'user_id': -1,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        for i in range(37):
-            sample[f'feature_{i}'] = np.random.rand()
-        
-        noise_data.append(sample)
-    
-    noise_df = pd.DataFrame(noise_data)
-    combined_df = pd.concat([df, noise_df], ignore_index=True)
-    return combined_df
-
-def generate_dataset(output_path='data/palm_dataset.csv'):
+
+    rng = np.random.default_rng(seed)
+    noise_df = chunk_to_frame(
+        np.full(num_noise, -1, dtype=np.int32),
+        np.full(num_noise, int(time.time()), dtype=np.int64),
+        rng.random((num_noise, NUM_FEATURES), dtype=np.float32)
+    )
+    return pd.concat([df, noise_df], ignore_index=True)
+
+def write_csv_dataset(output_path, num_samples=50000, num_users=1000, noise_ratio=0.05, chunk_size=1_000_000, seed=42):
+    total = 0
+    for i, chunk in enumerate(generate_palm_chunks(num_samples, num_users, noise_ratio, chunk_size, seed)):
+        chunk_to_frame(*chunk).to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        total += len(chunk[0])
+    return total
+
+def generate_dataset(output_path='data/palm_dataset.csv', num_samples=50000, num_users=1000,
+                     noise_ratio=0.05, chunk_size=1_000_000, seed=42, output_format='csv'):
     print("🚀 Palm Biometric Dataset Generation")
     print("=" * 50)
-    
-    df = generate_palm_features(num_samples=50000, num_users=1000)
-    df = add_noise_samples(df, noise_ratio=0.05)
-    df = df.sample(frac=1, random_state=42).reset_index(drop=True)
-    
-    df.to_csv(output_path, index=False)
-    
+
+    start_time = time.perf_counter()
+    if output_format == 'npy':
+        total = write_npy_dataset(output_path, num_samples, num_users, noise_ratio, chunk_size, seed)
+    else:
+        total = write_csv_dataset(output_path, num_samples, num_users, noise_ratio, chunk_size, seed)
+    elapsed = time.perf_counter() - start_time
+
     print(f"\n✅ Dataset saved to {output_path}")
-    print(f"Total samples: {len(df)}")
-    print(f"Features per sample: 37")
-    print(f"Unique users: {df['user_id'].nunique()}")
-    print("\n📊 Dataset Statistics:")
-    print(df.describe())
-    
-    return df
+    print(f"Total samples: {total}")
+    print(f"Features per sample: {NUM_FEATURES}")
+    print(f"Unique users: {num_users}")
+    print(f"Generation time: {elapsed:.1f}s ({total / elapsed:.0f} samples/s)")
+
+    return total
 
 if __name__ == '__main__':
-    df = generate_dataset()
+    parser = argparse.ArgumentParser(description="Generate a synthetic palm biometric dataset")
+    parser.add_argument('--samples', type=int, default=50000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--noise-ratio', type=float, default=0.05)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--format', choices=('csv', 'npy'), default='csv')
+    parser.add_argument('--output', default=None, help="CSV file, or directory of .npy columns")
+    args = parser.parse_args()
+
+    output = args.output or ('data/palm_dataset.csv' if args.format == 'csv' else 'data/palm_dataset')
+    generate_dataset(output, args.samples, args.users, args.noise_ratio, args.chunk_size, args.seed, args.format)
@@ -1,54 +1,195 @@
+import copy
 import numpy as np
-import tensorflow as tf
-from tensorflow import keras
+import os
 import pickle
 import json
 import time
+from inference_batcher import MicroBatcher
+from numpy_inference import NumpyPalmModel, softmax, log_sum_exp
+from quantization import QuantizedPalmModel
 
 class BiometricAuthenticator:
-    def __init__(self, model_path='models/'):
-        self.model = keras.models.load_model(f'{model_path}palm_biometric_model.h5')
+    def __init__(self, model_path='models/', backend='auto'):
+        numpy_model_path = f'{model_path}palm_biometric_model.npz'
+        if backend == 'auto':
+            backend = 'numpy' if os.path.exists(numpy_model_path) else 'keras'
         
-        with open(f'{model_path}scaler.pkl', 'rb') as f:
-            self.scaler = pickle.load(f)
+        self.backend = backend
+        
+        if backend == 'numpy':
+            # Scaler and BatchNorm are folded into the exported weights
+            self.model = NumpyPalmModel.load(numpy_model_path)
+            self.scaler = None
+        elif backend == 'int8':
+            self.model = QuantizedPalmModel.load(f'{model_path}palm_biometric_model_int8.npz')
+            self.scaler = None
+        else:
+            from tensorflow import keras
+            self.model = keras.models.load_model(f'{model_path}palm_biometric_model.h5')
+            
+            with open(f'{model_path}scaler.pkl', 'rb') as f:
+                self.scaler = pickle.load(f)
         
         with open(f'{model_path}config.json', 'r') as f:
             self.config = json.load(f)
         
-        print(f"✅ Model loaded - Version {self.config['model_version']}")
+        # Softmax temperature fitted on held-out data; 1.0 leaves the model's scores as trained
+        self.temperature = float(self.config.get('calibration', {}).get('temperature', 1.0))
+        self.batcher = None
+        
+        print(f"✅ Model loaded - Version {self.config['model_version']} ({self.backend} backend)")
+    
+    def predict_batch(self, features_batch):
+        return softmax(self.predict_logits(features_batch))
+    
+    def predict_logits(self, features_batch):
+        features_batch = np.asarray(features_batch, dtype=np.float32)
+        if self.scaler is None:
+            logits = self.model.logits(features_batch)
+        else:
+            # The Keras graph ends in softmax; log-probabilities are logits up to a per-row constant
+            probabilities = np.asarray(self.model.predict_on_batch(self.scaler.transform(features_batch)))
+            logits = np.log(np.maximum(probabilities, 1e-30))
+        
+        return logits / self.temperature if self.temperature != 1.0 else logits
+    
+    def unbatched(self):
+        # Shares the loaded model but calls it directly, e.g. to time compute without queue waits
+        if self.batcher is None:
+            return self
+        clone = copy.copy(self)
+        clone.batcher = None
+        return clone
+    
+    def enable_batching(self, max_batch_size=32, max_wait_ms=2.0):
+        self.batcher = MicroBatcher(self.predict_logits, max_batch_size, max_wait_ms)
+        return self.batcher
     
     def authenticate(self, features, threshold=0.85):
         start_time = time.time()
+        user_ids, confidences = self.identify_logits(self._single_logits(features))
         
-        features_scaled = self.scaler.transform([features])
-        predictions = self.model.predict(features_scaled, verbose=0)
-        
-        user_id = np.argmax(predictions[0])
-        confidence = float(predictions[0][user_id])
-        
-        inference_time = (time.time() - start_time) * 1000
+        return {
+            'authenticated': bool(confidences[0] >= threshold),
+            'user_id': int(user_ids[0]),
+            'confidence': float(confidences[0]),
+            'threshold': threshold,
+            'inference_time_ms': round((time.time() - start_time) * 1000, 2)
+        }
+    
+    def verify(self, features, claimed_user_id, threshold=0.85, top_k=0):
+        start_time = time.time()
+        scores = self.claimed_scores(self._single_logits(features), [claimed_user_id], threshold, top_k)
         
         result = {
-            'authenticated': confidence >= threshold,
-            'user_id': int(user_id),
-            'confidence': confidence,
-            'threshold': threshold,
-            'inference_time_ms': round(inference_time, 2)
+            'verified': bool(scores['verified'][0]),
+            'confidence': float(scores['probability'][0]),
+            'log_probability': _finite_or_none(scores['log_probability'])[0],
+            'margin': _finite_or_none(scores['margin'])[0],
+            'inference_time_ms': round((time.time() - start_time) * 1000, 2)
         }
         
+        if top_k:
+            result['top_k'] = [
+                {'user_id': int(user_id), 'probability': float(probability)}
+                for user_id, probability in zip(scores['top_k_ids'][0], scores['top_k_probabilities'][0])
+            ]
+        
         return result
     
-    def verify(self, features, claimed_user_id, threshold=0.85):
-        auth_result = self.authenticate(features, threshold)
+    def authenticate_batch(self, features_batch, threshold=0.85):
+        start_time = time.time()
+        user_ids, confidences = self.score_batch(features_batch)
+        
+        return {
+            'authenticated': (confidences >= threshold).tolist(),
+            'user_id': user_ids.tolist(),
+            'confidence': confidences.tolist(),
+            'threshold': threshold,
+            'count': len(user_ids),
+            'inference_time_ms': round((time.time() - start_time) * 1000, 2)
+        }
+    
+    def verify_batch(self, features_batch, claimed_user_ids, threshold=0.85, chunk_size=4096):
+        start_time = time.time()
+        features_batch = np.asarray(features_batch, dtype=np.float32)
+        claimed_user_ids = np.asarray(claimed_user_ids, dtype=np.int64)
         
-        verified = (auth_result['user_id'] == claimed_user_id and 
-                   auth_result['authenticated'])
+        chunks = [
+            self.claimed_scores(self.predict_logits(features_batch[start:start + chunk_size]),
+                                claimed_user_ids[start:start + chunk_size], threshold)
+            for start in range(0, len(features_batch), chunk_size)
+        ]
         
         return {
-            'verified': verified,
-            'confidence': auth_result['confidence'],
-            'inference_time_ms': auth_result['inference_time_ms']
+            'verified': np.concatenate([chunk['verified'] for chunk in chunks]).tolist(),
+            'confidence': np.concatenate([chunk['probability'] for chunk in chunks]).tolist(),
+            'margin': _finite_or_none(np.concatenate([chunk['margin'] for chunk in chunks])),
+            'threshold': threshold,
+            'count': len(features_batch),
+            'inference_time_ms': round((time.time() - start_time) * 1000, 2)
         }
+    
+    def score_batch(self, features_batch, chunk_size=4096):
+        features_batch = np.asarray(features_batch, dtype=np.float32)
+        user_ids = np.empty(len(features_batch), dtype=np.int64)
+        confidences = np.empty(len(features_batch), dtype=np.float32)
+        
+        # Chunking bounds the (rows x classes) logit matrix for very large requests
+        for start in range(0, len(features_batch), chunk_size):
+            chunk_ids, chunk_confidences = self.identify_logits(
+                self.predict_logits(features_batch[start:start + chunk_size]))
+            user_ids[start:start + chunk_size] = chunk_ids
+            confidences[start:start + chunk_size] = chunk_confidences
+        
+        return user_ids, confidences
+    
+    def identify_logits(self, logits):
+        user_ids = logits.argmax(axis=1)
+        best = logits[np.arange(len(logits)), user_ids]
+        return user_ids, np.exp(best - log_sum_exp(logits))
+    
+    def claimed_scores(self, logits, claimed_user_ids, threshold=0.85, top_k=0):
+        rows = np.arange(len(logits))
+        claimed_user_ids = np.asarray(claimed_user_ids, dtype=np.int64)
+        known = (claimed_user_ids >= 0) & (claimed_user_ids < logits.shape[1])
+        claimed_index = np.where(known, claimed_user_ids, 0)
+        
+        claimed_logits = logits[rows, claimed_index]
+        normalizer = log_sum_exp(logits)
+        log_probability = np.where(known, claimed_logits - normalizer, -np.inf)
+        
+        # The two largest logits give the runner-up without sorting the full row
+        k = min(max(top_k, 2), logits.shape[1])
+        top = np.argpartition(-logits, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(logits, top, axis=1), axis=1), axis=1)
+        
+        runner_up = np.where(top[:, 0] == claimed_index, top[:, 1], top[:, 0])
+        margin = np.where(known, claimed_logits - logits[rows, runner_up], -np.inf)
+        probability = np.exp(log_probability)
+        
+        scores = {
+            'verified': known & (margin > 0) & (probability >= threshold),
+            'probability': probability,
+            'log_probability': log_probability,
+            'margin': margin
+        }
+        
+        if top_k:
+            top = top[:, :top_k]
+            scores['top_k_ids'] = top
+            scores['top_k_probabilities'] = np.exp(np.take_along_axis(logits, top, axis=1) - normalizer[:, None])
+        
+        return scores
+    
+    def _single_logits(self, features):
+        if self.batcher is not None:
+            return self.batcher.predict(features)[None]
+        return self.predict_logits([features])
+
+def _finite_or_none(values):
+    # Unknown claimed users score -inf, which JSON cannot carry
+    return [float(value) if np.isfinite(value) else None for value in values.tolist()]
 
 def cosine_similarity(vec1, vec2):
     dot_product = np.dot(vec1, vec2)
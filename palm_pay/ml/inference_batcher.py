@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+
+class MicroBatcher:
+    def __init__(self, predict_batch, max_batch_size=32, max_wait_ms=2.0):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._stopped = False
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._largest_batch = 0
+
+        self._worker = threading.Thread(target=self._run, name='palm-micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, features):
+        future = Future()
+        features = np.asarray(features, dtype=np.float32)
+
+        with self._submit_lock:
+            if not self._stopped:
+                self._queue.put((features, future))
+                return future
+
+        # A retired model can still be holding late requests; score them inline
+        self._execute([(features, future)])
+        return future
+
+    def predict(self, features, timeout=None):
+        return self.submit(features).result(timeout)
+
+    def stop(self):
+        with self._submit_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'batches': self._batches,
+                'requests': self._requests,
+                'avg_batch_size': self._requests / self._batches if self._batches else 0.0,
+                'largest_batch': self._largest_batch,
+                'queued': self._queue.qsize(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000
+            }
+
+    def _run(self):
+        running = True
+        while running:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+
+            self._execute(batch)
+
+    def _execute(self, batch):
+        futures = [future for _, future in batch]
+
+        try:
+            predictions = self.predict_batch(np.stack([features for features, _ in batch]))
+        except Exception as error:
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        for future, prediction in zip(futures, predictions):
+            future.set_result(prediction)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._largest_batch = max(self._largest_batch, len(batch))
@@ -0,0 +1,91 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+class ExecutorSaturated(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Inference queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedInferenceExecutor:
+    def __init__(self, max_workers=4, max_queue=256, window=1024):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='palm-inference')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_ms = deque(maxlen=window)
+        self._run_ms = deque(maxlen=window)
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorSaturated(self.retry_after())
+
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        try:
+            return self._executor.submit(self._run, submitted_at, fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+
+    def retry_after(self):
+        with self._lock:
+            run_ms = np.mean(self._run_ms) if self._run_ms else 0.0
+            backlog = self._queued + self._running
+
+        # Time for the current backlog to drain across all workers, in whole seconds
+        return max(1, math.ceil(backlog * run_ms / self.max_workers / 1000))
+
+    def stats(self):
+        with self._lock:
+            wait_ms = np.array(self._wait_ms) if self._wait_ms else np.zeros(1)
+            run_ms = np.array(self._run_ms) if self._run_ms else np.zeros(1)
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queue_depth': self._queued,
+                'running': self._running,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'wait_ms_avg': float(wait_ms.mean()),
+                'wait_ms_p99': float(np.percentile(wait_ms, 99)),
+                'run_ms_avg': float(run_ms.mean()),
+                'run_ms_p99': float(np.percentile(run_ms, 99))
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def _run(self, submitted_at, fn, args, kwargs):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_ms.append((started_at - submitted_at) * 1000)
+
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._run_ms.append((time.perf_counter() - started_at) * 1000)
+            self._slots.release()
@@ -0,0 +1,136 @@
+import threading
+import time
+import traceback
+
+
+class ModelLoader:
+    def __init__(self, load, warmup=None, retire=None, retire_after=30.0, version=None):
+        self.load = load
+        self.warmup = warmup
+        self.retire = retire
+        self.retire_after = retire_after
+
+        self.status = 'idle'
+        self.error = None
+        self.version = version
+        self.load_time_ms = None
+        self.warmup_time_ms = None
+        self.swaps = 0
+        self.swap_status = None
+        self.swap_error = None
+        self._components = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._swap_lock = threading.Lock()
+        # Bumped by every install; the initial load only installs if no swap beat it
+        self._generation = 0
+        self._install_lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def start(self):
+        if self._thread is None:
+            self.status = 'loading'
+            self._thread = threading.Thread(target=self._run, name='palm-model-loader', daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def get(self):
+        return self._components if self.ready else None
+
+    def swap(self, load, version=None):
+        # The current components keep serving until the replacement is warm
+        thread = threading.Thread(target=self._run_swap, args=(load, version), name='palm-model-swap', daemon=True)
+        thread.start()
+        return thread
+
+    def state(self):
+        return {
+            'status': self.status,
+            'ready': self.ready,
+            'error': self.error,
+            'version': self.version,
+            'load_time_ms': self.load_time_ms,
+            'warmup_time_ms': self.warmup_time_ms,
+            'swaps': self.swaps,
+            'swap_status': self.swap_status,
+            'swap_error': self.swap_error
+        }
+
+    def _load_and_warm(self, load, on_warmup):
+        start_time = time.perf_counter()
+        components = load()
+        load_time_ms = round((time.perf_counter() - start_time) * 1000, 2)
+
+        warmup_time_ms = None
+        if self.warmup is not None:
+            on_warmup()
+            start_time = time.perf_counter()
+            self.warmup(components)
+            warmup_time_ms = round((time.perf_counter() - start_time) * 1000, 2)
+
+        return components, load_time_ms, warmup_time_ms
+
+    def _run(self):
+        generation = self._generation
+        try:
+            components, load_time_ms, warmup_time_ms = self._load_and_warm(
+                self.load, lambda: setattr(self, 'status', 'warming_up'))
+        except Exception as error:
+            with self._install_lock:
+                if self._generation == generation:
+                    self.status = 'failed'
+                    self.error = f"{type(error).__name__}: {error}"
+            traceback.print_exc()
+            return
+
+        with self._install_lock:
+            # A hot swap finished first; its model is newer than the one loaded at startup
+            stale = self._generation != generation
+            if not stale:
+                self._generation += 1
+                self._components = components
+                self.load_time_ms = load_time_ms
+                self.warmup_time_ms = warmup_time_ms
+                self.status = 'ready'
+                self._ready.set()
+
+        if stale and self.retire is not None:
+            self.retire(components)
+
+    def _run_swap(self, load, version):
+        with self._swap_lock:
+            try:
+                self.swap_status = f'loading {version}'
+                components, load_time_ms, warmup_time_ms = self._load_and_warm(
+                    load, lambda: setattr(self, 'swap_status', f'warming_up {version}'))
+            except Exception as error:
+                self.swap_status = 'failed'
+                self.swap_error = f"{version}: {type(error).__name__}: {error}"
+                traceback.print_exc()
+                return
+
+            # Single reference assignment; handlers that already fetched the old tuple finish on it
+            with self._install_lock:
+                self._generation += 1
+                previous = self._components
+                self._components = components
+                self.version = version
+                self.load_time_ms = load_time_ms
+                self.warmup_time_ms = warmup_time_ms
+                self.swaps += 1
+                self.swap_status = 'swapped'
+                self.swap_error = None
+                self.status = 'ready'
+                self.error = None
+                self._ready.set()
+
+        if previous is not None and self.retire is not None:
+            timer = threading.Timer(self.retire_after, self.retire, args=(previous,))
+            timer.daemon = True
+            timer.start()
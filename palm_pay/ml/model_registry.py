@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+
+MANIFEST = 'manifest.json'
+ACTIVE_POINTER = 'ACTIVE'
+CANDIDATE_POINTER = 'CANDIDATE'
+ARTIFACTS = (
+    'palm_biometric_model.npz',
+    'palm_biometric_model_int8.npz',
+    'palm_biometric_model.h5',
+    'scaler.pkl',
+    'geometry_gate.npz',
+    'config.json'
+)
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, root='models/registry'):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, version):
+        return os.path.join(self.root, version) + os.sep
+
+    def versions(self):
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, name, MANIFEST))
+        )
+
+    def manifest(self, version):
+        with open(os.path.join(self.root, version, MANIFEST), 'r') as f:
+            return json.load(f)
+
+    def publish(self, source_dir, version):
+        if os.path.exists(os.path.join(self.root, version)):
+            raise ValueError(f"Model version {version} already exists")
+
+        files = [name for name in ARTIFACTS if os.path.exists(os.path.join(source_dir, name))]
+        if 'config.json' not in files:
+            raise ValueError(f"{source_dir} has no config.json")
+
+        # Stage into a hidden directory and rename, so watchers never see a partial version
+        staging = os.path.join(self.root, f'.{version}.tmp')
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        checksums = {}
+        for name in files:
+            shutil.copy2(os.path.join(source_dir, name), os.path.join(staging, name))
+            checksums[name] = file_checksum(os.path.join(staging, name))
+
+        with open(os.path.join(staging, MANIFEST), 'w') as f:
+            json.dump({
+                'version': version,
+                'created_at': datetime.now().isoformat(),
+                'files': checksums
+            }, f, indent=2)
+
+        os.rename(staging, os.path.join(self.root, version))
+        return self.manifest(version)
+
+    def verify(self, version):
+        manifest = self.manifest(version)
+        for name, expected in manifest['files'].items():
+            actual = file_checksum(os.path.join(self.root, version, name))
+            if actual != expected:
+                raise ValueError(f"Checksum mismatch for {version}/{name}")
+        return manifest
+
+    def active_version(self):
+        return self._read_pointer(ACTIVE_POINTER)
+
+    def candidate_version(self):
+        return self._read_pointer(CANDIDATE_POINTER)
+
+    def promote(self, version):
+        self.verify(version)
+        self._write_pointer(ACTIVE_POINTER, version)
+        if self.candidate_version() == version:
+            self._write_pointer(CANDIDATE_POINTER, None)
+
+    def set_candidate(self, version):
+        if version is not None:
+            self.verify(version)
+        self._write_pointer(CANDIDATE_POINTER, version)
+
+    def _read_pointer(self, name):
+        try:
+            with open(os.path.join(self.root, name), 'r') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_pointer(self, name, version):
+        path = os.path.join(self.root, name)
+        if version is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as f:
+            f.write(version)
+        os.replace(temporary, path)
+
+
+class RegistryWatcher:
+    def __init__(self, registry, on_active, on_candidate=None, interval=2.0):
+        self.registry = registry
+        self.on_active = on_active
+        self.on_candidate = on_candidate
+        self.interval = interval
+
+        self.active = registry.active_version()
+        self.candidate = registry.candidate_version()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='palm-registry-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            active = self.registry.active_version()
+            if active and active != self.active:
+                self.active = active
+                self.on_active(active)
+
+            candidate = self.registry.candidate_version()
+            if candidate != self.candidate and self.on_candidate is not None:
+                self.candidate = candidate
+                self.on_candidate(candidate)
+
+
+if __name__ == '__main__':
+    registry = ModelRegistry()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+
+    if command == 'publish':
+        source_dir = sys.argv[2]
+        with open(os.path.join(source_dir, 'config.json'), 'r') as f:
+            default_version = f"{json.load(f)['model_version']}-{time.strftime('%Y%m%d%H%M%S')}"
+        manifest = registry.publish(source_dir, sys.argv[3] if len(sys.argv) > 3 else default_version)
+        print(f"✅ Published {manifest['version']} ({len(manifest['files'])} files)")
+    elif command == 'promote':
+        registry.promote(sys.argv[2])
+        print(f"✅ Active version: {sys.argv[2]}")
+    elif command == 'shadow':
+        registry.set_candidate(sys.argv[2] if len(sys.argv) > 2 else None)
+        print(f"✅ Shadow candidate: {registry.candidate_version()}")
+    else:
+        active = registry.active_version()
+        candidate = registry.candidate_version()
+        for version in registry.versions():
+            marker = ' (active)' if version == active else ' (shadow)' if version == candidate else ''
+            print(f"{version}{marker}")
@@ -0,0 +1,201 @@
+import json
+import time
+import numpy as np
+
+
+# Every affine step (scaler, BatchNorm) is pushed into the input side of the next Dense layer
+def fold_layers(layers, scaler_mean=None, scaler_scale=None):
+    folded = []
+    scale = None
+    shift = None
+
+    if scaler_mean is not None:
+        scale = 1.0 / np.asarray(scaler_scale, dtype=np.float64)
+        shift = -np.asarray(scaler_mean, dtype=np.float64) * scale
+
+    for layer in layers:
+        if layer['type'] == 'dropout':
+            continue
+
+        if layer['type'] == 'batch_norm':
+            bn_scale = layer['gamma'] / np.sqrt(layer['moving_variance'] + layer['epsilon'])
+            bn_shift = layer['beta'] - layer['moving_mean'] * bn_scale
+
+            if scale is None:
+                scale, shift = bn_scale, bn_shift
+            else:
+                scale, shift = scale * bn_scale, shift * bn_scale + bn_shift
+            continue
+
+        if layer['type'] != 'dense':
+            raise ValueError(f"Cannot fold layer type {layer['type']}")
+
+        weights = np.asarray(layer['kernel'], dtype=np.float64)
+        bias = np.asarray(layer['bias'], dtype=np.float64)
+
+        if scale is not None:
+            bias = bias + shift @ weights
+            weights = scale[:, None] * weights
+            scale = shift = None
+
+        folded.append((weights.astype(np.float32), bias.astype(np.float32), layer['activation']))
+
+    if scale is not None:
+        raise ValueError("A BatchNorm layer after the final Dense layer cannot be folded")
+
+    return folded
+
+
+def keras_layers(model):
+    layers = []
+    for layer in model.layers:
+        name = type(layer).__name__
+
+        if name == 'Dense':
+            kernel, bias = layer.get_weights()
+            layers.append({
+                'type': 'dense',
+                'kernel': kernel,
+                'bias': bias,
+                'activation': layer.get_config()['activation']
+            })
+        elif name == 'BatchNormalization':
+            gamma, beta, moving_mean, moving_variance = layer.get_weights()
+            layers.append({
+                'type': 'batch_norm',
+                'gamma': gamma,
+                'beta': beta,
+                'moving_mean': moving_mean,
+                'moving_variance': moving_variance,
+                'epsilon': layer.epsilon
+            })
+        elif name == 'Dropout':
+            layers.append({'type': 'dropout'})
+        else:
+            raise ValueError(f"Unsupported layer for NumPy export: {name}")
+
+    return layers
+
+
+def export_numpy_model(model, scaler, path):
+    folded = fold_layers(keras_layers(model), scaler.mean_, scaler.scale_)
+
+    arrays = {}
+    for i, (weights, bias, _) in enumerate(folded):
+        arrays[f'weights_{i}'] = weights
+        arrays[f'bias_{i}'] = bias
+
+    np.savez(path, activations=np.array(json.dumps([activation for _, _, activation in folded])), **arrays)
+    return folded
+
+
+def softmax(logits):
+    probabilities = logits - logits.max(axis=1, keepdims=True)
+    np.exp(probabilities, out=probabilities)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    return probabilities
+
+
+def log_sum_exp(logits):
+    peak = logits.max(axis=1)
+    return peak + np.log(np.exp(logits - peak[:, None]).sum(axis=1))
+
+
+def fit_temperature(logits, labels, min_temperature=0.05, max_temperature=20.0, iterations=60):
+    # Temperature scaling: the T minimizing held-out NLL of softmax(logits / T). The NLL is
+    # convex in 1/T, so a golden-section search over the inverse temperature finds the optimum
+    logits = np.asarray(logits, dtype=np.float64)
+    labels = np.asarray(labels)
+    known = (labels >= 0) & (labels < logits.shape[1])
+    logits, labels = logits[known], labels[known]
+    if len(labels) == 0:
+        return 1.0
+
+    target = logits[np.arange(len(labels)), labels]
+
+    def nll(beta):
+        return float(np.mean(log_sum_exp(logits * beta) - target * beta))
+
+    ratio = (np.sqrt(5) - 1) / 2
+    low, high = 1.0 / max_temperature, 1.0 / min_temperature
+    a, b = high - ratio * (high - low), low + ratio * (high - low)
+    nll_a, nll_b = nll(a), nll(b)
+    for _ in range(iterations):
+        if nll_a < nll_b:
+            high, b, nll_b = b, a, nll_a
+            a = high - ratio * (high - low)
+            nll_a = nll(a)
+        else:
+            low, a, nll_a = a, b, nll_b
+            b = low + ratio * (high - low)
+            nll_b = nll(b)
+
+    return float(2.0 / (low + high))
+
+
+class NumpyPalmModel:
+    def __init__(self, layers):
+        self.layers = [
+            (np.ascontiguousarray(weights, dtype=np.float32), np.asarray(bias, dtype=np.float32), activation)
+            for weights, bias, activation in layers
+        ]
+        self.input_features = self.layers[0][0].shape[0]
+
+        if any(layer[-1] == 'softmax' for layer in self.layers[:-1]):
+            raise ValueError("Softmax is only supported on the output layer")
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        activations = json.loads(str(data['activations']))
+        return cls([
+            (data[f'weights_{i}'], data[f'bias_{i}'], activation)
+            for i, activation in enumerate(activations)
+        ])
+
+    def predict(self, features):
+        return softmax(self.logits(features))
+
+    def logits(self, features):
+        x = np.atleast_2d(np.asarray(features, dtype=np.float32))
+
+        for weights, bias, activation in self.layers:
+            x = x @ weights
+            x += bias
+
+            if activation == 'relu':
+                np.maximum(x, 0, out=x)
+            elif activation not in ('softmax', 'linear'):
+                raise ValueError(f"Unsupported activation: {activation}")
+
+        return x
+
+
+def benchmark_numpy_model(path='models/palm_biometric_model.npz', batch_sizes=(1, 32, 256), iterations=1000):
+    model = NumpyPalmModel.load(path)
+    rng = np.random.default_rng(0)
+
+    results = {}
+    for batch_size in batch_sizes:
+        batch = rng.random((batch_size, model.input_features)).astype(np.float32)
+        model.predict(batch)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            model.predict(batch)
+        elapsed = (time.perf_counter() - start) / iterations
+
+        results[batch_size] = {
+            'latency_us': elapsed * 1e6,
+            'throughput_per_s': batch_size / elapsed
+        }
+
+    return results
+
+
+if __name__ == '__main__':
+    print("🚀 NumPy Inference Benchmark")
+    print("=" * 50)
+
+    for batch_size, row in benchmark_numpy_model().items():
+        print(f"Batch {batch_size:>4}: {row['latency_us']:.1f} µs/batch, {row['throughput_per_s']:.0f} samples/s")
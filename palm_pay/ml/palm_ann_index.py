@@ -0,0 +1,301 @@
+import json
+import threading
+import time
+import numpy as np
+from palm_index import PalmIdentificationIndex
+
+
+class IVFPalmIndex:
+    def __init__(self, dim=128, nlist=1024, nprobe=16, auto_train_size=None,
+                 kmeans_iterations=20, seed=42):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.auto_train_size = auto_train_size or nlist * 39
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+
+        self.centroids = None
+        self._lists = [self._empty_list()]
+        self._locations = {}
+        self._lock = threading.RLock()
+        # Store generation this index reflects; callers replay newer store changes onto it
+        self.generation = 0
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __contains__(self, user_id):
+        return user_id in self._locations
+
+    def add(self, user_id, embedding):
+        self.add_many([user_id], [embedding])
+
+    def add_many(self, user_ids, embeddings):
+        vectors = self._normalize_rows(embeddings)
+
+        with self._lock:
+            assignments = self._assign(vectors)
+            for user_id, vector, list_id in zip(user_ids, vectors, assignments):
+                if user_id in self._locations:
+                    self._remove_locked(user_id)
+                self._append(int(list_id), user_id, vector)
+
+            if not self.is_trained and len(self._locations) >= self.auto_train_size:
+                self.train()
+
+    def remove(self, user_id):
+        with self._lock:
+            return self._remove_locked(user_id)
+
+    def train(self, sample_size=None):
+        with self._lock:
+            vectors, user_ids = self._all_vectors()
+            if len(vectors) < self.nlist:
+                return False
+
+            rng = np.random.default_rng(self.seed)
+            sample_size = min(len(vectors), sample_size or self.nlist * 256)
+            sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+            self.centroids = self._spherical_kmeans(sample, rng)
+            self._lists = [self._empty_list() for _ in range(self.nlist)]
+            self._locations = {}
+
+            for list_id, user_id, vector in zip(self._assign(vectors), user_ids, vectors):
+                self._append(int(list_id), user_id, vector)
+            return True
+
+    def search(self, query, k=1, nprobe=None):
+        vector = self._normalize_rows(query)[0]
+
+        with self._lock:
+            if not self._locations:
+                return []
+
+            if self.is_trained:
+                probes = min(nprobe or self.nprobe, self.nlist)
+                centroid_scores = self.centroids @ vector
+                probed = np.argpartition(centroid_scores, self.nlist - probes)[self.nlist - probes:]
+            else:
+                probed = [0]
+
+            candidate_ids = []
+            candidate_scores = []
+            for list_id in probed:
+                inverted = self._lists[list_id]
+                if not inverted['ids']:
+                    continue
+                candidate_scores.append(inverted['vectors'][:len(inverted['ids'])] @ vector)
+                candidate_ids.extend(inverted['ids'])
+
+            if not candidate_ids:
+                return []
+
+            scores = np.concatenate(candidate_scores)
+            k = min(k, len(scores))
+            top = np.argpartition(scores, len(scores) - k)[len(scores) - k:]
+            top = top[np.argsort(scores[top])[::-1]]
+
+            return [(candidate_ids[i], float(scores[i])) for i in top]
+
+    def identify(self, query, threshold, nprobe=None):
+        matches = self.search(query, k=2, nprobe=nprobe)
+        if not matches:
+            return False, None, 0.0, 0.0
+
+        user_id, similarity = matches[0]
+        runner_up = matches[1][1] if len(matches) > 1 else 0.0
+        margin = similarity - runner_up
+
+        if similarity < threshold:
+            return False, None, similarity, margin
+        return True, user_id, similarity, margin
+
+    def save(self, path):
+        with self._lock:
+            vectors, user_ids = self._all_vectors()
+            list_sizes = np.array([len(inverted['ids']) for inverted in self._lists], dtype=np.int64)
+
+            np.savez(
+                path,
+                vectors=vectors,
+                list_sizes=list_sizes,
+                centroids=self.centroids if self.is_trained else np.empty((0, self.dim), dtype=np.float32),
+                ids=np.array(json.dumps(user_ids)),
+                generation=np.array(self.generation),
+                params=np.array(json.dumps({
+                    'dim': self.dim,
+                    'nlist': self.nlist,
+                    'nprobe': self.nprobe,
+                    'auto_train_size': self.auto_train_size,
+                    'kmeans_iterations': self.kmeans_iterations,
+                    'seed': self.seed
+                }))
+            )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        index = cls(**json.loads(str(data['params'])))
+
+        user_ids = json.loads(str(data['ids']))
+        vectors = data['vectors']
+        list_sizes = data['list_sizes']
+
+        if 'generation' in data.files:
+            index.generation = int(data['generation'])
+        if len(data['centroids']):
+            index.centroids = data['centroids']
+        index._lists = [index._empty_list() for _ in range(len(list_sizes))]
+
+        offset = 0
+        for list_id, size in enumerate(list_sizes):
+            for row in range(offset, offset + size):
+                index._append(list_id, user_ids[row], vectors[row])
+            offset += size
+
+        return index
+
+    def _spherical_kmeans(self, sample, rng):
+        centroids = sample[rng.choice(len(sample), self.nlist, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            assignments = self._nearest_centroids(sample, centroids)
+
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=self.nlist)
+
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+
+            centroids = self._normalize_rows(sums)
+
+        return centroids
+
+    def _assign(self, vectors):
+        if not self.is_trained:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return self._nearest_centroids(vectors, self.centroids)
+
+    def _nearest_centroids(self, vectors, centroids, chunk_bytes=64 * 1024 * 1024):
+        # Bound the chunk-by-nlist similarity block; a full training sample against 1024 lists is ~1 GB
+        chunk_size = max(1, chunk_bytes // (4 * len(centroids)))
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            assignments[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+        return assignments
+
+    def _append(self, list_id, user_id, vector):
+        inverted = self._lists[list_id]
+        row = len(inverted['ids'])
+
+        if row == len(inverted['vectors']):
+            grown = np.zeros((max(8, row * 2), self.dim), dtype=np.float32)
+            grown[:row] = inverted['vectors'][:row]
+            inverted['vectors'] = grown
+
+        inverted['vectors'][row] = vector
+        inverted['ids'].append(user_id)
+        self._locations[user_id] = (list_id, row)
+
+    def _remove_locked(self, user_id):
+        location = self._locations.pop(user_id, None)
+        if location is None:
+            return False
+
+        list_id, row = location
+        inverted = self._lists[list_id]
+        last = len(inverted['ids']) - 1
+
+        if row != last:
+            moved_id = inverted['ids'][last]
+            inverted['vectors'][row] = inverted['vectors'][last]
+            inverted['ids'][row] = moved_id
+            self._locations[moved_id] = (list_id, row)
+
+        inverted['ids'].pop()
+        return True
+
+    def _all_vectors(self):
+        vectors = [inverted['vectors'][:len(inverted['ids'])] for inverted in self._lists]
+        user_ids = [user_id for inverted in self._lists for user_id in inverted['ids']]
+        return np.concatenate(vectors) if vectors else np.empty((0, self.dim), dtype=np.float32), user_ids
+
+    def _empty_list(self):
+        return {'vectors': np.zeros((0, self.dim), dtype=np.float32), 'ids': []}
+
+    def _normalize_rows(self, embeddings):
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+
+def benchmark_recall(index, exact_index, queries, k=10, nprobe_values=(1, 4, 8, 16, 32, 64)):
+    exact_results = []
+    start = time.perf_counter()
+    for query in queries:
+        exact_results.append({user_id for user_id, _ in exact_index.search(query, k)})
+    exact_latency = (time.perf_counter() - start) / len(queries) * 1000
+
+    rows = []
+    for nprobe in nprobe_values:
+        hits = 0
+        start = time.perf_counter()
+        for query, truth in zip(queries, exact_results):
+            found = {user_id for user_id, _ in index.search(query, k, nprobe=nprobe)}
+            hits += len(found & truth)
+        latency = (time.perf_counter() - start) / len(queries) * 1000
+
+        rows.append({
+            'nprobe': nprobe,
+            'recall_at_k': hits / (len(queries) * k),
+            'latency_ms': latency,
+            'speedup': exact_latency / latency if latency > 0 else float('inf')
+        })
+
+    return {'k': k, 'exact_latency_ms': exact_latency, 'results': rows}
+
+
+def main(num_palms=200000, dim=128, nlist=1024, num_queries=200):
+    print("🚀 Palm ANN Index Benchmark")
+    print("=" * 50)
+
+    rng = np.random.default_rng(0)
+    clusters = rng.normal(size=(nlist // 4, dim)).astype(np.float32)
+    embeddings = (clusters[rng.integers(0, len(clusters), num_palms)] +
+                  rng.normal(0, 0.6, (num_palms, dim)).astype(np.float32))
+    user_ids = [f"user_{i:07d}" for i in range(num_palms)]
+
+    exact = PalmIdentificationIndex(dim=dim, initial_capacity=num_palms)
+    exact.add_many(user_ids, embeddings)
+
+    print(f"🔄 Training IVF index ({nlist} lists) on {num_palms} palms...")
+    start = time.perf_counter()
+    ivf = IVFPalmIndex(dim=dim, nlist=nlist)
+    ivf.add_many(user_ids, embeddings)
+    if not ivf.is_trained:
+        ivf.train()
+    print(f"  Build time: {time.perf_counter() - start:.2f}s")
+
+    probes = rng.integers(0, num_palms, num_queries)
+    queries = embeddings[probes] + rng.normal(0, 0.2, (num_queries, dim)).astype(np.float32)
+
+    report = benchmark_recall(ivf, exact, queries)
+    print(f"\nExact scan: {report['exact_latency_ms']:.3f} ms/query")
+    print(f"{'nprobe':>8} {'recall@' + str(report['k']):>10} {'ms/query':>10} {'speedup':>8}")
+    for row in report['results']:
+        print(f"{row['nprobe']:>8} {row['recall_at_k']:>10.3f} {row['latency_ms']:>10.3f} {row['speedup']:>7.1f}x")
+
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+import threading
+import numpy as np
+
+
+class PalmIdentificationIndex:
+    def __init__(self, dim=128, initial_capacity=1024):
+        self.dim = dim
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._ids = []
+        self._rows = {}
+        self._lock = threading.RLock()
+        self.generation = 0
+        # Bumped whenever a row below the current size is rewritten, so searches can run unlocked
+        self._epoch = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, user_id):
+        return user_id in self._rows
+
+    def add(self, user_id, embedding):
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None:
+                row = len(self._ids)
+                self._ensure_capacity(row + 1)
+                self._ids.append(user_id)
+                self._rows[user_id] = row
+            else:
+                self._epoch += 1
+            self._matrix[row] = vector
+
+    def add_many(self, user_ids, embeddings):
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors = vectors / norms
+
+        with self._lock:
+            for user_id, vector in zip(user_ids, vectors):
+                row = self._rows.get(user_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._ensure_capacity(row + 1)
+                    self._ids.append(user_id)
+                    self._rows[user_id] = row
+                else:
+                    self._epoch += 1
+                self._matrix[row] = vector
+
+    def remove(self, user_id):
+        with self._lock:
+            row = self._rows.pop(user_id, None)
+            if row is None:
+                return False
+
+            self._epoch += 1
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+
+            self._ids.pop()
+            self._matrix[last] = 0
+            return True
+
+    def export(self):
+        with self._lock:
+            return list(self._ids), self._matrix[:len(self._ids)].copy()
+
+    def search(self, query, k=1):
+        vector = self._normalize(query)
+
+        while True:
+            with self._lock:
+                matrix, size, epoch = self._matrix, len(self._ids), self._epoch
+            if size == 0:
+                return []
+
+            # Appends only write rows past size and growth swaps in a new matrix, so the
+            # snapshot stays valid unless a remove or re-enroll rewrote a row meanwhile
+            scores = matrix[:size] @ vector
+            k = min(k, size)
+
+            if k == 1:
+                top = np.array([np.argmax(scores)])
+            else:
+                top = np.argpartition(scores, size - k)[size - k:]
+                top = top[np.argsort(scores[top])[::-1]]
+
+            with self._lock:
+                if self._epoch == epoch:
+                    return [(self._ids[i], float(scores[i])) for i in top]
+
+    def identify(self, query, threshold):
+        matches = self.search(query, k=2)
+        if not matches:
+            return False, None, 0.0, 0.0
+
+        user_id, similarity = matches[0]
+        runner_up = matches[1][1] if len(matches) > 1 else 0.0
+        margin = similarity - runner_up
+
+        if similarity < threshold:
+            return False, None, similarity, margin
+        return True, user_id, similarity, margin
+
+    def _normalize(self, embedding):
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Expected embedding of size {self.dim}, got {vector.shape[0]}")
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _ensure_capacity(self, size):
+        capacity = len(self._matrix)
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:len(self._ids)] = self._matrix[:len(self._ids)]
+        self._matrix = grown
@@ -8,9 +8,18 @@ MIT License
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import hmac
 import numpy as np
+import os
+import threading
 import time
 import uuid
+from palm_index import PalmIdentificationIndex
+from palm_ann_index import IVFPalmIndex
+from palm_pq import PQPalmIndex
+from embedding_store import MemmapEmbeddingStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 app = Flask(__name__)
 CORS(app)
@@ -24,6 +33,128 @@ PALM_DATABASE = {
 
 SIMILARITY_THRESHOLD = 0.85
 
+# Enrolled embeddings persist in an append-only memory-mapped store shared by all workers;
+# each worker's index catches up from the store generation before it answers a query
+PALM_STORE = MemmapEmbeddingStore(
+    os.environ.get("PALM_STORE_PATH", os.path.join(BASE_DIR, "data", "palm_embeddings")), dim=128
+)
+if len(PALM_STORE) == 0:
+    PALM_STORE.append_many(list(PALM_DATABASE.keys()), list(PALM_DATABASE.values()))
+
+# "auto" scans exactly while that stays sub-millisecond, then switches to IVF
+PALM_INDEX_TYPE = os.environ.get("PALM_INDEX_TYPE", "auto")
+PALM_INDEX_PATH = os.environ.get("PALM_INDEX_PATH", os.path.join(BASE_DIR, "models", "palm_ivf_index.npz"))
+# A single-core exact scan of 128-d float32 takes about 0.6 ms at 20k palms and 3 ms at 100k
+EXACT_SCAN_LIMIT = int(os.environ.get("PALM_EXACT_SCAN_LIMIT", 20000))
+
+# Enrollment and removal change who can pay, so they need an operator token
+PALM_ADMIN_TOKEN = os.environ.get("PALM_ADMIN_TOKEN")
+
+
+def resolve_index_type(size):
+    if PALM_INDEX_TYPE != "auto":
+        return PALM_INDEX_TYPE
+    return "ivf" if size > EXACT_SCAN_LIMIT else "exact"
+
+
+def new_ivf_index():
+    return IVFPalmIndex(
+        dim=128,
+        nlist=int(os.environ.get("PALM_IVF_NLIST", 1024)),
+        nprobe=int(os.environ.get("PALM_IVF_NPROBE", 16))
+    )
+
+
+def load_palm_index(index_type):
+    if not os.path.exists(PALM_INDEX_PATH):
+        return None
+    try:
+        index = (PQPalmIndex if index_type == "pq" else IVFPalmIndex).load(PALM_INDEX_PATH)
+    except KeyError:
+        # Saved by the other index type
+        return None
+    # A store that was reset behind the saved index cannot be replayed onto it
+    return index if index.generation <= PALM_STORE.generation else None
+
+
+def save_palm_index(index):
+    if isinstance(index, PalmIdentificationIndex) or not index.is_trained:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(PALM_INDEX_PATH)), exist_ok=True)
+    temp_path = f"{PALM_INDEX_PATH}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        index.save(f)
+    os.replace(temp_path, PALM_INDEX_PATH)
+
+
+def sync_palm_index(index):
+    # Replays store changes the index has not seen; only the last change per user matters
+    with PALM_INDEX_LOCK:
+        generation, changes = PALM_STORE.changes(index.generation)
+        latest = dict(changes)
+
+        for user_id in [user_id for user_id, embedding in latest.items() if embedding is None]:
+            index.remove(user_id)
+        enrolled = [(user_id, embedding) for user_id, embedding in latest.items() if embedding is not None]
+        if enrolled:
+            user_ids, embeddings = zip(*enrolled)
+            index.add_many(list(user_ids), np.stack(embeddings))
+
+        index.generation = generation
+    return index
+
+
+def build_palm_index():
+    index_type = resolve_index_type(len(PALM_STORE))
+    index = load_palm_index(index_type) if index_type in ("ivf", "pq") else None
+    if index is not None:
+        return sync_palm_index(index)
+
+    if index_type == "pq":
+        index = PQPalmIndex(dim=128)
+    elif index_type == "ivf":
+        index = new_ivf_index()
+    else:
+        index = PalmIdentificationIndex(dim=128)
+
+    sync_palm_index(index)
+    if isinstance(index, IVFPalmIndex) and not index.is_trained:
+        index.train()
+    save_palm_index(index)
+    return index
+
+
+def refresh_palm_index():
+    # Another worker may have enrolled or removed palms; the generation check is one stat call
+    if PALM_STORE.generation != PALM_INDEX.generation:
+        sync_palm_index(PALM_INDEX)
+        promote_palm_index()
+    return PALM_INDEX
+
+
+def needs_promotion():
+    return resolve_index_type(len(PALM_INDEX)) == "ivf" and not isinstance(PALM_INDEX, IVFPalmIndex)
+
+
+def promote_palm_index():
+    # The exact scan outgrew its latency budget; rebuild once as a trained IVF index
+    global PALM_INDEX
+    if not needs_promotion():
+        return
+    # One request trains the replacement; the others keep searching the exact index meanwhile
+    if not PALM_PROMOTE_LOCK.acquire(blocking=False):
+        return
+    try:
+        if needs_promotion():
+            PALM_INDEX = build_palm_index()
+    finally:
+        PALM_PROMOTE_LOCK.release()
+
+
+PALM_INDEX_LOCK = threading.Lock()
+PALM_PROMOTE_LOCK = threading.Lock()
+PALM_INDEX = build_palm_index()
+
 
 # -------------------------------
 # Utility Functions
@@ -36,15 +167,34 @@ def generate_transaction_id():
     return f"TXN-{uuid.uuid4().hex[:10].upper()}"
 
 
+def parse_palm_embedding(value):
+    try:
+        palm_embedding = np.array(value, dtype=np.float32).ravel()
+    except (TypeError, ValueError):
+        return None
+    if palm_embedding.size != PALM_INDEX.dim or not np.isfinite(palm_embedding).all():
+        return None
+    return palm_embedding
+
+
+def require_admin():
+    if not PALM_ADMIN_TOKEN:
+        return jsonify({
+            "status": "FAILED",
+            "reason": "Palm enrollment is disabled: PALM_ADMIN_TOKEN is not configured"
+        }), 503
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), PALM_ADMIN_TOKEN.encode()):
+        return jsonify({"status": "FAILED", "reason": "Unauthorized"}), 401
+    return None
+
+
 # -------------------------------
 # Autonomous Agents (Simulated)
 # -------------------------------
 def biometric_verification_agent(palm_embedding):
-    for user_id, stored_embedding in PALM_DATABASE.items():
-        similarity = cosine_similarity(palm_embedding, stored_embedding)
-        if similarity >= SIMILARITY_THRESHOLD:
-            return True, user_id, similarity
-    return False, None, 0.0
+    return refresh_palm_index().identify(palm_embedding, SIMILARITY_THRESHOLD)
 
 
 def gesture_analysis_agent(gesture):
@@ -69,14 +219,26 @@ def fraud_detection_agent(similarity_score, gesture_confidence):
 @app.route("/api/transaction/process", methods=["POST"])
 def process_transaction():
     start_time = time.time()
-    data = request.json
+    data = request.get_json(silent=True) or {}
 
-    palm_embedding = np.array(data.get("palm_embedding"))
+    palm_embedding = parse_palm_embedding(data.get("palm_embedding"))
     gesture = data.get("gesture")
     gesture_confidence = data.get("gesture_confidence", 0.0)
 
+    if palm_embedding is None:
+        return jsonify({
+            "status": "FAILED",
+            "reason": f"Expected a finite numeric palm embedding of size {PALM_INDEX.dim}"
+        }), 400
+    if isinstance(gesture_confidence, bool) or not isinstance(gesture_confidence, (int, float)) \
+            or not np.isfinite(gesture_confidence):
+        return jsonify({
+            "status": "FAILED",
+            "reason": "gesture_confidence must be a finite number"
+        }), 400
+
     # 1. Biometric Verification
-    verified, user_id, similarity = biometric_verification_agent(palm_embedding)
+    verified, user_id, similarity, margin = biometric_verification_agent(palm_embedding)
     if not verified:
         return jsonify({
             "status": "FAILED",
@@ -109,10 +271,47 @@ def process_transaction():
         "user_id": user_id,
         "intent": intent,
         "biometric_similarity": round(similarity, 3),
+        "match_margin": round(margin, 3),
         "latency_ms": latency
     })
 
 
+# -------------------------------
+# Palm Enrollment
+# -------------------------------
+@app.route("/api/palm/enroll", methods=["POST"])
+def enroll_palm():
+    denied = require_admin()
+    if denied:
+        return denied
+
+    data = request.get_json(silent=True) or {}
+    user_id = data.get("user_id")
+    palm_embedding = parse_palm_embedding(data.get("palm_embedding"))
+
+    if not user_id or palm_embedding is None:
+        return jsonify({
+            "status": "FAILED",
+            "reason": f"user_id and a {PALM_INDEX.dim}-d palm_embedding are required"
+        }), 400
+
+    PALM_STORE.append(user_id, palm_embedding)
+    refresh_palm_index()
+    return jsonify({"status": "ENROLLED", "user_id": user_id, "enrolled": len(PALM_INDEX)})
+
+
+@app.route("/api/palm/<user_id>", methods=["DELETE"])
+def remove_palm(user_id):
+    denied = require_admin()
+    if denied:
+        return denied
+
+    if not PALM_STORE.remove(user_id):
+        return jsonify({"status": "FAILED", "reason": "User not enrolled"}), 404
+    refresh_palm_index()
+    return jsonify({"status": "REMOVED", "user_id": user_id, "enrolled": len(PALM_INDEX)})
+
+
 # -------------------------------
 # Health Check
 # -------------------------------
@@ -0,0 +1,332 @@
+import json
+import threading
+import time
+import numpy as np
+from palm_index import PalmIdentificationIndex
+
+
+class ProductQuantizer:
+    def __init__(self, dim=128, num_subvectors=16, num_centroids=256, kmeans_iterations=25, seed=42):
+        if dim % num_subvectors:
+            raise ValueError(f"dim {dim} is not divisible by {num_subvectors} sub-vectors")
+        if num_centroids > 256:
+            raise ValueError("At most 256 centroids fit in a uint8 code")
+
+        self.dim = dim
+        self.num_subvectors = num_subvectors
+        self.num_centroids = num_centroids
+        self.sub_dim = dim // num_subvectors
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self.codebooks = None
+
+    @property
+    def is_trained(self):
+        return self.codebooks is not None
+
+    def train(self, vectors, max_samples_per_centroid=100):
+        vectors = self._split(vectors)
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = self.num_centroids * max_samples_per_centroid
+        if len(vectors) > sample_size:
+            vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+        self.codebooks = np.stack([
+            self._kmeans(vectors[:, m], rng) for m in range(self.num_subvectors)
+        ])
+        return self
+
+    def encode(self, vectors):
+        vectors = self._split(vectors)
+        codes = np.empty((self.num_subvectors, len(vectors)), dtype=np.uint8)
+
+        for m in range(self.num_subvectors):
+            codes[m] = self._nearest(vectors[:, m], self.codebooks[m])
+        return codes
+
+    def decode(self, codes):
+        return np.concatenate([
+            self.codebooks[m][codes[m]] for m in range(self.num_subvectors)
+        ], axis=1)
+
+    def inner_product_table(self, query):
+        sub_queries = np.asarray(query, dtype=np.float32).reshape(self.num_subvectors, self.sub_dim)
+        return np.einsum('mkd,md->mk', self.codebooks, sub_queries)
+
+    def asymmetric_scores(self, table, codes):
+        scores = table[0].take(codes[0])
+        for m in range(1, self.num_subvectors):
+            scores += table[m].take(codes[m])
+        return scores
+
+    def _split(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        return vectors.reshape(len(vectors), self.num_subvectors, self.sub_dim)
+
+    def _nearest(self, vectors, centroids, chunk_size=65536):
+        centroid_norms = (centroids ** 2).sum(axis=1)
+        return np.concatenate([
+            np.argmin(centroid_norms[None, :] - 2 * vectors[start:start + chunk_size] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), chunk_size)
+        ])
+
+    def _kmeans(self, vectors, rng):
+        k = min(self.num_centroids, len(vectors))
+        centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            assignments = self._nearest(vectors, centroids)
+            counts = np.bincount(assignments, minlength=k)
+
+            sums = np.stack([
+                np.bincount(assignments, weights=vectors[:, d], minlength=k) for d in range(self.sub_dim)
+            ], axis=1)
+
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            if (~filled).any():
+                centroids[~filled] = vectors[rng.choice(len(vectors), int((~filled).sum()), replace=False)]
+
+        if k < self.num_centroids:
+            centroids = np.vstack([centroids, np.repeat(centroids[-1:], self.num_centroids - k, axis=0)])
+        return centroids
+
+
+class PQPalmIndex:
+    def __init__(self, dim=128, num_subvectors=16, num_centroids=256, auto_train_size=10000,
+                 initial_capacity=1024):
+        self.dim = dim
+        self.quantizer = ProductQuantizer(dim, num_subvectors, num_centroids)
+        self.auto_train_size = auto_train_size
+        self._staging = PalmIdentificationIndex(dim=dim)
+        self._codes = np.zeros((num_subvectors, initial_capacity), dtype=np.uint8)
+        self._ids = []
+        self._rows = {}
+        self._lock = threading.RLock()
+        # Store generation this index reflects; callers replay newer store changes onto it
+        self.generation = 0
+
+    @property
+    def is_trained(self):
+        return self.quantizer.is_trained
+
+    def __len__(self):
+        return len(self._ids) + len(self._staging)
+
+    def __contains__(self, user_id):
+        return user_id in self._rows or user_id in self._staging
+
+    def memory_bytes(self):
+        codebook_bytes = self.quantizer.codebooks.nbytes if self.is_trained else 0
+        return len(self._ids) * self.quantizer.num_subvectors + codebook_bytes
+
+    def add(self, user_id, embedding):
+        self.add_many([user_id], [embedding])
+
+    def add_many(self, user_ids, embeddings):
+        vectors = self._normalize_rows(embeddings)
+
+        with self._lock:
+            if not self.is_trained:
+                self._staging.add_many(user_ids, vectors)
+                if len(self._staging) >= self.auto_train_size:
+                    self.train()
+                return
+
+            codes = self.quantizer.encode(vectors)
+            rows = np.empty(len(codes[0]), dtype=np.int64)
+
+            for i, user_id in enumerate(user_ids):
+                row = self._rows.get(user_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._ids.append(user_id)
+                    self._rows[user_id] = row
+                rows[i] = row
+
+            self._ensure_capacity(len(self._ids))
+            self._codes[:, rows] = codes
+
+    def remove(self, user_id):
+        with self._lock:
+            if self._staging.remove(user_id):
+                return True
+
+            row = self._rows.pop(user_id, None)
+            if row is None:
+                return False
+
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._codes[:, row] = self._codes[:, last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+
+            self._ids.pop()
+            return True
+
+    def train(self, vectors=None):
+        with self._lock:
+            staged_ids, staged = self._staging.export()
+
+            self.quantizer.train(staged if vectors is None else vectors)
+            self._staging = PalmIdentificationIndex(dim=self.dim)
+            if staged_ids:
+                self.add_many(staged_ids, staged)
+
+    def search(self, query, k=1):
+        vector = self._normalize_rows(query)[0]
+
+        with self._lock:
+            if not self.is_trained:
+                return self._staging.search(vector, k)
+
+            size = len(self._ids)
+            if size == 0:
+                return []
+
+            table = self.quantizer.inner_product_table(vector)
+            scores = self.quantizer.asymmetric_scores(table, self._codes[:, :size])
+
+            k = min(k, size)
+            top = np.argpartition(scores, size - k)[size - k:]
+            top = top[np.argsort(scores[top])[::-1]]
+
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+    def identify(self, query, threshold):
+        matches = self.search(query, k=2)
+        if not matches:
+            return False, None, 0.0, 0.0
+
+        user_id, similarity = matches[0]
+        runner_up = matches[1][1] if len(matches) > 1 else 0.0
+        margin = similarity - runner_up
+
+        if similarity < threshold:
+            return False, None, similarity, margin
+        return True, user_id, similarity, margin
+
+    def save(self, path):
+        with self._lock:
+            if not self.is_trained:
+                raise ValueError("Train the index before saving it")
+
+            np.savez(
+                path,
+                codebooks=self.quantizer.codebooks,
+                codes=self._codes[:, :len(self._ids)],
+                ids=np.array(json.dumps(self._ids)),
+                generation=np.array(self.generation),
+                params=np.array(json.dumps({
+                    'dim': self.dim,
+                    'num_subvectors': self.quantizer.num_subvectors,
+                    'num_centroids': self.quantizer.num_centroids,
+                    'auto_train_size': self.auto_train_size
+                }))
+            )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        user_ids = json.loads(str(data['ids']))
+
+        index = cls(**json.loads(str(data['params'])), initial_capacity=max(1, len(user_ids)))
+        index.quantizer.codebooks = data['codebooks']
+        index._codes[:, :len(user_ids)] = data['codes']
+        index._ids = user_ids
+        index._rows = {user_id: row for row, user_id in enumerate(user_ids)}
+        if 'generation' in data.files:
+            index.generation = int(data['generation'])
+        return index
+
+    def _ensure_capacity(self, size):
+        capacity = self._codes.shape[1]
+        if size <= capacity:
+            return
+
+        used = capacity
+        while capacity < size:
+            capacity *= 2
+
+        grown = np.zeros((self._codes.shape[0], capacity), dtype=np.uint8)
+        grown[:, :used] = self._codes
+        self._codes = grown
+
+    def _normalize_rows(self, embeddings):
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+
+def evaluate_pq(num_palms=100000, dim=128, num_queries=500, noise=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.random((num_palms, dim)).astype(np.float32) - 0.5
+    user_ids = list(range(num_palms))
+
+    exact = PalmIdentificationIndex(dim=dim, initial_capacity=num_palms)
+    exact.add_many(user_ids, embeddings)
+
+    start = time.perf_counter()
+    pq_index = PQPalmIndex(dim=dim, auto_train_size=num_palms + 1)
+    pq_index.add_many(user_ids, embeddings)
+    pq_index.train()
+    build_time = time.perf_counter() - start
+
+    probes = rng.integers(0, num_palms, num_queries)
+    queries = embeddings[probes] + rng.normal(0, noise, (num_queries, dim)).astype(np.float32)
+
+    exact_top1 = 0
+    pq_top1 = 0
+    agreement = 0
+    recall_at_10 = 0
+    pq_latency = 0.0
+    exact_latency = 0.0
+
+    for query, true_id in zip(queries, probes):
+        start = time.perf_counter()
+        exact_matches = exact.search(query, 10)
+        exact_latency += time.perf_counter() - start
+
+        start = time.perf_counter()
+        pq_matches = pq_index.search(query, 10)
+        pq_latency += time.perf_counter() - start
+
+        exact_top1 += exact_matches[0][0] == true_id
+        pq_top1 += pq_matches[0][0] == true_id
+        agreement += pq_matches[0][0] == exact_matches[0][0]
+        recall_at_10 += len({u for u, _ in pq_matches} & {u for u, _ in exact_matches}) / 10
+
+    float64_bytes = num_palms * dim * 8
+    return {
+        'num_palms': num_palms,
+        'build_time_s': build_time,
+        'exact_identification_rate': exact_top1 / num_queries,
+        'pq_identification_rate': pq_top1 / num_queries,
+        'top1_agreement': agreement / num_queries,
+        'recall_at_10': recall_at_10 / num_queries,
+        'exact_latency_ms': exact_latency / num_queries * 1000,
+        'pq_latency_ms': pq_latency / num_queries * 1000,
+        'float64_bytes': float64_bytes,
+        'pq_bytes': pq_index.memory_bytes(),
+        'compression_ratio': float64_bytes / pq_index.memory_bytes()
+    }
+
+
+if __name__ == '__main__':
+    print("🚀 Palm PQ Codec Evaluation")
+    print("=" * 50)
+
+    report = evaluate_pq()
+    print(f"Palms enrolled: {report['num_palms']}")
+    print(f"Build time: {report['build_time_s']:.2f}s")
+    print(f"Identification rate (exact): {report['exact_identification_rate']:.4f}")
+    print(f"Identification rate (PQ): {report['pq_identification_rate']:.4f}")
+    print(f"Top-1 agreement with exact: {report['top1_agreement']:.4f}")
+    print(f"Recall@10 vs exact: {report['recall_at_10']:.4f}")
+    print(f"Latency exact/PQ: {report['exact_latency_ms']:.3f} / {report['pq_latency_ms']:.3f} ms")
+    print(f"Memory float64: {report['float64_bytes'] / 1e6:.1f} MB")
+    print(f"Memory PQ: {report['pq_bytes'] / 1e6:.1f} MB ({report['compression_ratio']:.0f}x smaller)")
@@ -0,0 +1,135 @@
+import json
+import numpy as np
+from numpy_inference import NumpyPalmModel, softmax
+
+INT8_MAX = 127
+
+
+def quantize_per_channel(weights):
+    # Symmetric int8 with one scale per output channel (column)
+    max_abs = np.abs(weights).max(axis=0)
+    scales = np.where(max_abs > 0, max_abs / INT8_MAX, 1.0).astype(np.float32)
+    quantized = np.clip(np.round(weights / scales), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return quantized, scales
+
+
+def calibrate_input_scales(model, calibration, percentile=99.99):
+    scales = []
+    x = np.atleast_2d(np.asarray(calibration, dtype=np.float32))
+
+    for weights, bias, activation in model.layers:
+        max_abs = np.percentile(np.abs(x), percentile)
+        scales.append(np.float32(max_abs / INT8_MAX if max_abs > 0 else 1.0))
+
+        x = x @ weights + bias
+        if activation == 'relu':
+            x = np.maximum(x, 0)
+
+    return scales
+
+
+def quantize_model(model, calibration, percentile=99.99):
+    input_scales = calibrate_input_scales(model, calibration, percentile)
+    return QuantizedPalmModel([
+        (*quantize_per_channel(weights), bias, input_scale, activation)
+        for (weights, bias, activation), input_scale in zip(model.layers, input_scales)
+    ])
+
+
+class QuantizedPalmModel:
+    def __init__(self, layers):
+        # INT8 is the storage format only. NumPy has no int8 GEMM and its integer matmul bypasses
+        # BLAS, so weights are widened to float32 once and the int8 copy is not kept in memory
+        self.layers = [
+            (np.asarray(weights, dtype=np.int8).astype(np.float32), np.asarray(weight_scales, dtype=np.float32),
+             np.asarray(bias, dtype=np.float32), np.float32(input_scale), activation)
+            for weights, weight_scales, bias, input_scale, activation in layers
+        ]
+        self.input_features = self.layers[0][0].shape[0]
+        self._output_scales = [input_scale * weight_scales
+                               for _, weight_scales, _, input_scale, _ in self.layers]
+
+        if any(layer[-1] == 'softmax' for layer in self.layers[:-1]):
+            raise ValueError("Softmax is only supported on the output layer")
+
+        if max(layer[0].shape[0] for layer in self.layers) > 1040:
+            raise ValueError("Layers wider than 1040 inputs would overflow exact float32 accumulation")
+
+    @property
+    def nbytes(self):
+        # Resident weight memory: the widened float32 weights plus per-channel scales
+        return sum(weights.nbytes + weight_scales.nbytes + bias.nbytes + output_scales.nbytes + 4
+                   for (weights, weight_scales, bias, _, _), output_scales in zip(self.layers, self._output_scales))
+
+    @property
+    def storage_nbytes(self):
+        # Weight bytes in the saved .npz, where weights are one byte each
+        return sum(weights.size + weight_scales.nbytes + bias.nbytes + 4
+                   for weights, weight_scales, bias, _, _ in self.layers)
+
+    def predict(self, features):
+        return softmax(self.logits(features))
+
+    def logits(self, features):
+        x = np.atleast_2d(np.asarray(features, dtype=np.float32))
+
+        for (weights, _, bias, input_scale, activation), output_scales in zip(self.layers, self._output_scales):
+            x_q = x / input_scale
+            np.rint(x_q, out=x_q)
+            np.clip(x_q, -INT8_MAX, INT8_MAX, out=x_q)
+
+            # Sums of up to 1040 int8 x int8 products stay below 2^24, so a float32
+            # GEMM on the integer values is an exact integer accumulation
+            x = x_q @ weights
+            x *= output_scales
+            x += bias
+
+            if activation == 'relu':
+                np.maximum(x, 0, out=x)
+            elif activation not in ('softmax', 'linear'):
+                raise ValueError(f"Unsupported activation: {activation}")
+
+        return x
+
+    def save(self, path):
+        arrays = {}
+        for i, (weights, weight_scales, bias, input_scale, _) in enumerate(self.layers):
+            # The widened weights hold exact integers, so narrowing back to int8 is lossless
+            arrays[f'weights_{i}'] = weights.astype(np.int8)
+            arrays[f'weight_scales_{i}'] = weight_scales
+            arrays[f'bias_{i}'] = bias
+            arrays[f'input_scale_{i}'] = input_scale
+
+        np.savez(path, activations=np.array(json.dumps([layer[-1] for layer in self.layers])), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        activations = json.loads(str(data['activations']))
+        return cls([
+            (data[f'weights_{i}'], data[f'weight_scales_{i}'], data[f'bias_{i}'],
+             data[f'input_scale_{i}'], activation)
+            for i, activation in enumerate(activations)
+        ])
+
+
+def float_model_bytes(model):
+    return sum(weights.nbytes + bias.nbytes for weights, bias, _ in model.layers)
+
+
+if __name__ == '__main__':
+    from generate_dataset import load_dataset, split_dataset
+
+    print("🚀 INT8 Post-Training Quantization")
+    print("=" * 50)
+
+    # Calibrate on training rows only, as train_model.py does, so the test split stays unseen
+    calibration = split_dataset(*load_dataset())[0][:2000]
+    float_model = NumpyPalmModel.load('models/palm_biometric_model.npz')
+    quantized = quantize_model(float_model, calibration)
+    quantized.save('models/palm_biometric_model_int8.npz')
+
+    print(f"Float32 weights: {float_model_bytes(float_model) / 1024:.1f} KB")
+    print(f"INT8 weights on disk: {quantized.storage_nbytes / 1024:.1f} KB")
+    print(f"INT8 weights in memory (widened to float32): {quantized.nbytes / 1024:.1f} KB")
+    print("✅ Quantized model saved to models/palm_biometric_model_int8.npz")
@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Fields that decide the outcome of each scored call
+DECISION_FIELDS = {
+    'authenticate': ('authenticated', 'user_id'),
+    'verify': ('verified',)
+}
+
+
+class ShadowScorer:
+    def __init__(self, sample_rate=1.0, max_pending=64, window=1024):
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.window = window
+
+        self.version = None
+        self._candidate = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='palm-shadow')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._reset()
+
+    @property
+    def active(self):
+        return self._candidate is not None
+
+    def set_candidate(self, components, version):
+        with self._lock:
+            previous = self._candidate
+            self._candidate = components
+            self.version = version
+            self._reset()
+        return previous
+
+    def observe(self, kind, args, primary_result, primary):
+        # `primary` must call its model directly, as the candidate does, so latencies compare
+        candidate = self._candidate
+        if candidate is None or random.random() >= self.sample_rate:
+            return
+
+        with self._lock:
+            # Shadow traffic is best-effort; never let it queue behind live requests
+            if self._pending >= self.max_pending:
+                self._dropped += 1
+                return
+            self._pending += 1
+
+        self._executor.submit(self._score, candidate, kind, args, primary_result, primary)
+
+    def stats(self):
+        with self._lock:
+            primary_ms = np.array(self._primary_ms) if self._primary_ms else np.zeros(1)
+            candidate_ms = np.array(self._candidate_ms) if self._candidate_ms else np.zeros(1)
+            confidence_delta = np.array(self._confidence_delta) if self._confidence_delta else np.zeros(1)
+            return {
+                'active': self._candidate is not None,
+                'candidate_version': self.version,
+                'sample_rate': self.sample_rate,
+                'compared': self._compared,
+                'agreement': self._agreed / self._compared if self._compared else None,
+                'pending': self._pending,
+                'dropped': self._dropped,
+                'errors': self._errors,
+                'primary_ms_avg': float(primary_ms.mean()),
+                'primary_ms_p99': float(np.percentile(primary_ms, 99)),
+                'candidate_ms_avg': float(candidate_ms.mean()),
+                'candidate_ms_p99': float(np.percentile(candidate_ms, 99)),
+                'confidence_delta_avg': float(confidence_delta.mean())
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def _reset(self):
+        self._compared = 0
+        self._agreed = 0
+        self._dropped = 0
+        self._errors = 0
+        self._primary_ms = deque(maxlen=self.window)
+        self._candidate_ms = deque(maxlen=self.window)
+        self._confidence_delta = deque(maxlen=self.window)
+
+    def _score(self, candidate, kind, args, primary_result, primary):
+        try:
+            # Both models run back to back on this thread; alternate the order so neither
+            # side consistently benefits from warm caches
+            if self._compared % 2:
+                result, candidate_ms = self._timed(candidate, kind, args)
+                _, primary_ms = self._timed(primary, kind, args)
+            else:
+                _, primary_ms = self._timed(primary, kind, args)
+                result, candidate_ms = self._timed(candidate, kind, args)
+        except Exception:
+            traceback.print_exc()
+            with self._lock:
+                self._pending -= 1
+                self._errors += 1
+            return
+
+        agreed = all(result.get(field) == primary_result.get(field) for field in DECISION_FIELDS[kind])
+
+        with self._lock:
+            self._pending -= 1
+            # Counters were reset for a newer candidate while this one was in flight
+            if candidate is not self._candidate:
+                return
+
+            self._compared += 1
+            self._agreed += int(agreed)
+            self._primary_ms.append(primary_ms)
+            self._candidate_ms.append(candidate_ms)
+            self._confidence_delta.append(result.get('confidence', 0.0) - primary_result.get('confidence', 0.0))
+
+    def _timed(self, components, kind, args):
+        authenticator, verifier = components
+        target = verifier.verify if kind == 'verify' else getattr(authenticator, kind)
+
+        start_time = time.perf_counter()
+        result = target(*args)
+        return result, (time.perf_counter() - start_time) * 1000
@@ -2,12 +2,16 @@ import numpy as np
 import pandas as pd
 import tensorflow as tf
 from tensorflow import keras
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import mediapipe as mp
 import cv2
 import pickle
 import json
+from cascade_verifier import GeometryGate
+from numpy_inference import NumpyPalmModel, export_numpy_model, fit_temperature
+from quantization import quantize_model
+from model_registry import ModelRegistry
+from generate_dataset import load_dataset, split_dataset
 from datetime import datetime
 
 CONFIG = {
@@ -25,6 +29,8 @@ class PalmBiometricModel:
     def __init__(self):
         self.model = None
         self.scaler = StandardScaler()
+        self.geometry_gate = GeometryGate()
+        self.temperature = 1.0
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
@@ -102,6 +108,8 @@ class PalmBiometricModel:
     
     def train(self, X_train, y_train, X_val, y_val):
         X_train_scaled = self.scaler.fit_transform(X_train)
+        enrolled = y_train != -1
+        self.geometry_gate.fit(X_train[enrolled], y_train[enrolled])
         X_val_scaled = self.scaler.transform(X_val)
         
         callbacks = [
@@ -134,6 +142,13 @@ class PalmBiometricModel:
         
         return history
     
+    def calibrate(self, X_val, y_val):
+        # The graph ends in softmax; log-probabilities differ from logits by a per-row constant,
+        # which temperature scaling leaves unchanged
+        probabilities = self.model.predict(self.scaler.transform(X_val), verbose=0)
+        self.temperature = fit_temperature(np.log(np.maximum(probabilities, 1e-30)), y_val)
+        return self.temperature
+    
     def evaluate(self, X_test, y_test):
         X_test_scaled = self.scaler.transform(X_test)
         results = self.model.evaluate(X_test_scaled, y_test)
@@ -151,8 +166,11 @@ class PalmBiometricModel:
         with open(f'{path}scaler.pkl', 'wb') as f:
             pickle.dump(self.scaler, f)
         
+        self.geometry_gate.save(f'{path}geometry_gate.npz')
+        export_numpy_model(self.model, self.scaler, f'{path}palm_biometric_model.npz')
+        
         with open(f'{path}config.json', 'w') as f:
-            json.dump(CONFIG, f, indent=2)
+            json.dump({**CONFIG, 'calibration': {'temperature': self.temperature}}, f, indent=2)
         
         print(f"✅ Model saved to {path}")
     
@@ -163,12 +181,6 @@ class PalmBiometricModel:
         
         print(f"✅ Model loaded from {path}")
 
-def load_dataset(dataset_path='data/palm_dataset.csv'):
-    df = pd.read_csv(dataset_path)
-    X = df.drop(['user_id', 'timestamp'], axis=1).values
-    y = df['user_id'].values
-    return X, y
-
 def main():
     print("🚀 PalmPay Biometric Model Training")
     print("=" * 50)
@@ -177,12 +189,7 @@ def main():
     X, y = load_dataset()
     print(f"Dataset size: {X.shape[0]} samples, {X.shape[1]} features")
     
-    X_train, X_temp, y_train, y_temp = train_test_split(
-        X, y, test_size=0.3, random_state=42, stratify=y
-    )
-    X_val, X_test, y_val, y_test = train_test_split(
-        X_temp, y_temp, test_size=0.5, random_state=42, stratify=y_temp
-    )
+    X_train, X_val, X_test, y_train, y_val, y_test = split_dataset(X, y)
     
     print(f"Training set: {X_train.shape[0]} samples")
     print(f"Validation set: {X_val.shape[0]} samples")
@@ -196,6 +203,10 @@ def main():
     print("\n🎯 Training model...")
     history = palm_model.train(X_train, y_train, X_val, y_val)
     
+    print("\n🌡️  Fitting softmax temperature on the validation split...")
+    temperature = palm_model.calibrate(X_val, y_val)
+    print(f"Temperature: {temperature:.3f}")
+    
     print("\n📈 Evaluating model...")
     metrics = palm_model.evaluate(X_test, y_test)
     print(f"Test Accuracy: {metrics['accuracy']:.4f}")
@@ -204,8 +215,17 @@ def main():
     print("\n💾 Saving model...")
     palm_model.save_model()
     
+    print("\n🔢 Quantizing model to INT8...")
+    float_model = NumpyPalmModel.load('models/palm_biometric_model.npz')
+    quantize_model(float_model, X_train[:2000]).save('models/palm_biometric_model_int8.npz')
+    
+    print("\n📦 Publishing to model registry...")
+    registry_version = f"{CONFIG['model_version']}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    ModelRegistry().publish('models/', registry_version)
+    
     print("\n✅ Training complete!")
     print(f"Model version: {CONFIG['model_version']}")
+    print(f"Registry version: {registry_version} (promote with: python model_registry.py promote {registry_version})")
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 if __name__ == '__main__':
@@ -0,0 +1,73 @@
+import time
+from collections import deque
+
+class CompoundGestureDetector:
+    def __init__(self, patterns, max_gap=1.5, separator='->'):
+        self.max_gap = max_gap
+        self.separator = separator
+        self._build(patterns)
+        self.reset()
+
+    def _build(self, patterns):
+        goto = [{}]
+        outputs = [None]
+
+        for pattern, action in patterns.items():
+            tokens = pattern.split(self.separator) if isinstance(pattern, str) else list(pattern)
+            state = 0
+            for token in tokens:
+                if token not in goto[state]:
+                    goto.append({})
+                    outputs.append(None)
+                    goto[state][token] = len(goto) - 1
+                state = goto[state][token]
+            outputs[state] = (len(tokens), action)
+
+        alphabet = {token for edges in goto for token in edges}
+        fail = [0] * len(goto)
+        transitions = [dict() for _ in goto]
+
+        queue = deque()
+        for token in alphabet:
+            child = goto[0].get(token, 0)
+            transitions[0][token] = child
+            if child:
+                queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            fallback = outputs[fail[state]]
+            if fallback and (outputs[state] is None or fallback[0] > outputs[state][0]):
+                outputs[state] = fallback
+
+            for token in alphabet:
+                child = goto[state].get(token)
+                if child is None:
+                    transitions[state][token] = transitions[fail[state]][token]
+                else:
+                    fail[child] = transitions[fail[state]][token]
+                    transitions[state][token] = child
+                    queue.append(child)
+
+        self.transitions = transitions
+        self.outputs = [output[1] if output else None for output in outputs]
+
+    def reset(self):
+        self.state = 0
+        self.last_timestamp = None
+        self.last_match = None
+
+    def advance(self, gesture_type, timestamp=None):
+        now = time.time() if timestamp is None else timestamp
+
+        if self.last_timestamp is not None and now - self.last_timestamp > self.max_gap:
+            self.state = 0
+        self.last_timestamp = now
+
+        self.state = self.transitions[self.state].get(gesture_type, 0)
+        self.last_match = self.outputs[self.state]
+
+        if self.last_match is not None:
+            self.state = 0
+
+        return self.last_match
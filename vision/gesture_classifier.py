@@ -2,12 +2,15 @@ import numpy as np
 from collections import deque
 from utils.logger import logger
 from utils.latency_monitor import measure_latency
+from template_recognizer import template_recognizer
+from compound_detector import CompoundGestureDetector
 
 class GestureClassifier:
-    def __init__(self, history_size=10, confidence_threshold=0.75):
+    def __init__(self, history_size=10, confidence_threshold=0.75, compound_timeout=1.5):
         self.history_size = history_size
         self.confidence_threshold = confidence_threshold
         self.gesture_history = deque(maxlen=history_size)
+        self.template_recognizer = template_recognizer
         
         self.gesture_templates = {
             'swipe_right': {'direction': 'horizontal', 'sign': 1, 'min_distance': 0.15},
@@ -21,11 +24,21 @@ class GestureClassifier:
             'palm_open': {'type': 'hand_state', 'fingers_extended': 4},
             'fist': {'type': 'hand_state', 'fingers_extended': 0}
         }
+        
+        self.compound_gestures = {
+            'swipe_right->tap->swipe_right': 'quick_pay',
+            'circle->tap': 'confirm_trade',
+            'palm_open->fist': 'cancel',
+            'swipe_up->swipe_down': 'refresh'
+        }
+        self.compound_detector = CompoundGestureDetector(self.compound_gestures, max_gap=compound_timeout)
     
     @measure_latency('gesture_classification')
-    def classify_gesture(self, trajectory_points, hand_data=None):
+    def classify_gesture(self, trajectory_points, hand_data=None, timestamp=None):
         if not trajectory_points or len(trajectory_points) < 2:
-            return self._classify_static_gesture(hand_data)
+            result = self._classify_static_gesture(hand_data)
+            self._track_compound(result, timestamp)
+            return result
         
         gesture_type = None
         confidence = 0.0
@@ -47,6 +60,12 @@ class GestureClassifier:
                 gesture_type = pinch_spread_result['type']
                 confidence = pinch_spread_result['confidence']
         
+        if not gesture_type:
+            template_result = self.template_recognizer.match(trajectory_points)
+            if template_result['is_valid']:
+                gesture_type = template_result['gesture_type']
+                confidence = template_result['confidence']
+        
         if not gesture_type:
             gesture_type = 'unknown'
             confidence = 0.0
@@ -59,9 +78,18 @@ class GestureClassifier:
         }
         
         self.gesture_history.append(result)
+        self._track_compound(result, timestamp)
         
         return result
     
+    def _track_compound(self, result, timestamp):
+        if not result['is_valid']:
+            return
+        
+        compound = self.compound_detector.advance(result['gesture_type'], timestamp)
+        if compound:
+            result['compound_gesture'] = compound
+    
     def _classify_static_gesture(self, hand_data):
         if not hand_data:
             return {
@@ -280,23 +308,10 @@ class GestureClassifier:
         }
     
     def detect_compound_gesture(self):
-        sequence = self.get_gesture_sequence(3)
-        
-        if not sequence:
-            return None
-        
-        pattern = sequence['pattern']
-        
-        compound_gestures = {
-            'swipe_right->tap->swipe_right': 'quick_pay',
-            'circle->tap': 'confirm_trade',
-            'palm_open->fist': 'cancel',
-            'swipe_up->swipe_down': 'refresh'
-        }
-        
-        return compound_gestures.get(pattern)
+        return self.compound_detector.last_match
     
     def reset_history(self):
         self.gesture_history.clear()
+        self.compound_detector.reset()
 
 gesture_classifier = GestureClassifier()
@@ -0,0 +1,194 @@
+import numpy as np
+from utils.logger import logger
+from utils.latency_monitor import measure_latency
+
+class TemplateGestureRecognizer:
+    def __init__(self, num_points=32, band_ratio=0.1, static_extent=0.02, confidence_threshold=0.75, search_chunk=8):
+        self.num_points = num_points
+        self.band = max(1, int(round(num_points * band_ratio)))
+        self.static_extent = static_extent
+        self.confidence_threshold = confidence_threshold
+        self.search_chunk = search_chunk
+
+        # DTW works in band coordinates: row i, offset k compares query point i with template point i - band + k
+        band_columns = np.arange(num_points)[:, None] + np.arange(-self.band, self.band + 1)[None]
+        self.band_valid = (band_columns >= 0) & (band_columns < num_points)
+        self.band_columns = np.clip(band_columns, 0, num_points - 1)
+        self.band_penalty = np.where(self.band_valid, 0.0, np.inf)
+
+        self.template_names = []
+        self.template_points = np.empty((0, num_points, 2))
+        self.upper_envelopes = np.empty((0, num_points, 2))
+        self.lower_envelopes = np.empty((0, num_points, 2))
+
+        self.load_templates(self._default_templates())
+
+    def load_templates(self, templates):
+        names = []
+        trajectories = []
+
+        for name, variants in templates.items():
+            for points in variants:
+                names.append(name)
+                trajectories.append(self.normalize(self.resample(points)))
+
+        self.template_names = names
+        self.template_points = np.array(trajectories).reshape(-1, self.num_points, 2)
+        self.upper_envelopes, self.lower_envelopes = self._build_envelopes(self.template_points)
+
+        logger.info(f'Loaded {len(names)} gesture templates')
+
+    def add_template(self, name, points):
+        template = self.normalize(self.resample(points))[None]
+        upper, lower = self._build_envelopes(template)
+
+        self.template_names.append(name)
+        self.template_points = np.concatenate([self.template_points, template])
+        self.upper_envelopes = np.concatenate([self.upper_envelopes, upper])
+        self.lower_envelopes = np.concatenate([self.lower_envelopes, lower])
+
+    def resample(self, points):
+        points = np.asarray(points, dtype=float)[:, :2]
+        if len(points) == 1:
+            return np.repeat(points, self.num_points, axis=0)
+
+        arc_length = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+        if arc_length[-1] <= 0:
+            return np.repeat(points[:1], self.num_points, axis=0)
+
+        targets = np.linspace(0, arc_length[-1], self.num_points)
+        return np.stack([
+            np.interp(targets, arc_length, points[:, 0]),
+            np.interp(targets, arc_length, points[:, 1])
+        ], axis=1)
+
+    def normalize(self, points):
+        centered = points - points.mean(axis=0)
+        extent = np.ptp(points, axis=0).max()
+        if extent <= 0:
+            return centered
+        return centered / extent
+
+    @measure_latency('template_matching')
+    def match(self, trajectory_points):
+        if not trajectory_points or len(trajectory_points) < 2:
+            return self._result('none', 0.0, None, 0)
+
+        points = np.asarray(trajectory_points, dtype=float)[:, :2]
+        if np.ptp(points, axis=0).max() < self.static_extent:
+            return self._result('tap', 0.7, None, len(points))
+
+        if not self.template_names:
+            return self._result('unknown', 0.0, None, len(points))
+
+        query = self.normalize(self.resample(points))
+        best_index, best_distance = self._nearest_template(query)
+
+        rms_error = np.sqrt(best_distance / self.num_points)
+        confidence = float(max(0.0, 1.0 - rms_error))
+
+        return self._result(self.template_names[best_index], confidence, float(best_distance), len(points))
+
+    def _nearest_template(self, query):
+        bounds = self._lb_keogh(query)
+        order = np.argsort(bounds)
+
+        # Visit templates in lower-bound order a few at a time; each batch abandons against the best
+        # distance so far, and once the next bound exceeds it no remaining template can win
+        best_index, best_distance = order[0], np.inf
+        for start in range(0, len(order), self.search_chunk):
+            candidates = order[start:start + self.search_chunk]
+            candidates = candidates[bounds[candidates] < best_distance]
+            if not len(candidates):
+                break
+
+            distances = self._dtw(query, candidates, best_distance)
+            closest = np.argmin(distances)
+            if distances[closest] < best_distance:
+                best_index = candidates[closest]
+                best_distance = distances[closest]
+
+        return best_index, best_distance
+
+    def _lb_keogh(self, query):
+        above = np.maximum(query[None] - self.upper_envelopes, 0)
+        below = np.maximum(self.lower_envelopes - query[None], 0)
+        return ((above + below) ** 2).sum(axis=(1, 2))
+
+    def _dtw(self, query, candidates, cutoff):
+        n = self.num_points
+        width = self.band_columns.shape[1]
+        distances = np.full(len(candidates), np.inf)
+
+        offsets = self.template_points[candidates][:, self.band_columns] - query[None, :, None]
+        costs = (offsets * offsets).sum(axis=3)
+        costs[:, ~self.band_valid] = 0
+
+        # Within a row, D[k] = min over m <= k of (entry[m] + costs[m..k]), one running minimum on prefix sums
+        cumulative = np.cumsum(costs, axis=2)
+        exclusive = cumulative - costs
+
+        alive = np.arange(len(candidates))
+        previous = np.full((len(candidates), width + 1), np.inf)
+        previous[:, :width] = cumulative[:, 0] + self.band_penalty[0]
+
+        for i in range(1, n):
+            entry = np.minimum(previous[:, :-1], previous[:, 1:])
+            row = np.minimum.accumulate(entry - exclusive[:, i], axis=1)
+            row += cumulative[:, i]
+            if i + self.band >= n:
+                row += self.band_penalty[i]
+
+            if cutoff < np.inf:
+                keep = row.min(axis=1) < cutoff
+                if not keep.all():
+                    alive = alive[keep]
+                    if not len(alive):
+                        return distances
+                    cumulative = cumulative[keep]
+                    exclusive = exclusive[keep]
+                    row = row[keep]
+                    previous = previous[keep]
+
+            previous[:, :width] = row
+
+        distances[alive] = previous[:, self.band]
+        return distances
+
+    def _build_envelopes(self, templates):
+        n = templates.shape[1]
+        windows = np.stack([
+            templates[:, np.clip(np.arange(n) + offset, 0, n - 1)]
+            for offset in range(-self.band, self.band + 1)
+        ])
+        return windows.max(axis=0), windows.min(axis=0)
+
+    def _result(self, gesture_type, confidence, distance, trajectory_length):
+        return {
+            'gesture_type': gesture_type,
+            'confidence': confidence,
+            'is_valid': confidence >= self.confidence_threshold,
+            'template_distance': distance,
+            'trajectory_length': trajectory_length
+        }
+
+    def _default_templates(self):
+        line = np.linspace(0, 1, self.num_points)
+        flat = np.zeros(self.num_points)
+
+        circles = []
+        theta = np.linspace(0, 2 * np.pi, self.num_points)
+        for start in np.arange(4) * np.pi / 2:
+            for direction in (1, -1):
+                angles = start + direction * theta
+                circles.append(np.stack([np.cos(angles), np.sin(angles)], axis=1))
+
+        return {
+            'swipe_right': [np.stack([line, flat], axis=1)],
+            'swipe_left': [np.stack([-line, flat], axis=1)],
+            'swipe_up': [np.stack([flat, -line], axis=1)],
+            'swipe_down': [np.stack([flat, line], axis=1)],
+            'circle': circles
+        }
+
+template_recognizer = TemplateGestureRecognizer()